@@ -0,0 +1,45 @@
+import hmac
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+
+from app.config import ADMIN_TOKEN
+from app.services.backfill import backfill
+from app.services.scheduler import scheduler
+from app.utils.profiling import TimedRoute
+
+router = APIRouter(prefix="/admin", tags=["Admin"], route_class=TimedRoute)
+
+
+def is_admin_token(token: str | None) -> bool:
+    """Does `token` match ADMIN_TOKEN? Always False while it is unset."""
+    return bool(ADMIN_TOKEN and token and hmac.compare_digest(token, ADMIN_TOKEN))
+
+
+def require_admin(x_admin_token: str | None = Header(None)):
+    """Allow the request only if X-Admin-Token matches ADMIN_TOKEN."""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+@router.post("/backfill", dependencies=[Depends(require_admin)])
+def run_backfill(
+    from_: datetime | None = Query(None, alias="from"),
+    to: datetime | None = None,
+):
+    """
+    Re-score stored readings in [from, to] with the current model and
+    rewrite data/prediction_history.csv. Returns a run summary.
+    """
+    return backfill(
+        start=from_.replace(tzinfo=None) if from_ else None,
+        end=to.replace(tzinfo=None) if to else None,
+    )
+
+
+@router.get("/scheduler", dependencies=[Depends(require_admin)])
+def get_scheduler_stats():
+    """Per-job interval, run/failure/overrun counts and durations (seconds)."""
+    return scheduler.stats()
@@ -1,11 +1,10 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from pathlib import Path
-import csv
 
-router = APIRouter(prefix="", tags=["Auth"])
+from app.services.user_directory import DuplicateEmailError, user_directory
+from app.utils.profiling import TimedRoute, phase
 
-USERS_CSV = Path("data/users.csv")  # adjust path if needed
+router = APIRouter(prefix="", tags=["Auth"], route_class=TimedRoute)
 
 
 # ==== REQUEST MODELS MATCH FRONTEND ====
@@ -58,31 +57,13 @@ def map_role(employee_id: str) -> str:
 @router.post("/register", response_model=AuthResponse)
 def register(req: RegisterRequest):
     """
-    Append user to data/users.csv with columns:
+    Store the user with fields:
     firstName,lastName,email,password,employeeId
     """
     try:
-        USERS_CSV.parent.mkdir(parents=True, exist_ok=True)
-        file_exists = USERS_CSV.exists()
-
-        with USERS_CSV.open("a", newline="") as f:
-            writer = csv.writer(f)
-
-            # optional: write header once
-            if not file_exists:
-                writer.writerow(
-                    ["firstName", "lastName", "email", "password", "employeeId"]
-                )
-
-            writer.writerow(
-                [
-                    req.firstName,
-                    req.lastName,
-                    req.email,
-                    req.password,
-                    req.employeeId,
-                ]
-            )
+        user_directory.register(req.model_dump())
+    except DuplicateEmailError:
+        raise HTTPException(status_code=409, detail="Email already registered")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save user: {e}")
 
@@ -99,34 +80,23 @@ def register(req: RegisterRequest):
 @router.post("/login", response_model=AuthResponse)
 def login(req: LoginRequest):
     """
-    Validate email+password against data/users.csv.
+    Validate email+password against the stored users.
     """
-    if not USERS_CSV.exists():
-        raise HTTPException(status_code=401, detail="Invalid email or password")
-
     try:
-        with USERS_CSV.open(newline="") as f:
-            reader = csv.reader(f)
-            rows = list(reader)
-
-            # skip header if present
-            if rows and rows[0] and rows[0][0] == "firstName":
-                rows = rows[1:]
-
-            for row in rows:
-                # must match the order written in /register
-                first_name, last_name, row_email, row_password, employee_id = row
-                if row_email == req.email and row_password == req.password:
-                    user = User(
-                        firstName=first_name,
-                        lastName=last_name,
-                        email=row_email,
-                        employeeId=employee_id,
-                        jobRole=map_role(employee_id),
-                    )
-                    return AuthResponse(success=True, user=user)
+        with phase("lookup"):
+            row = user_directory.find(req.email)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Auth error: {e}")
 
+    if row is not None and row["password"] == req.password:
+        user = User(
+            firstName=row["firstName"],
+            lastName=row["lastName"],
+            email=row["email"],
+            employeeId=row["employeeId"],
+            jobRole=map_role(row["employeeId"]),
+        )
+        return AuthResponse(success=True, user=user)
+
     # no matching row
     raise HTTPException(status_code=401, detail="Invalid email or password")
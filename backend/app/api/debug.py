@@ -0,0 +1,64 @@
+import time
+from urllib.parse import parse_qs
+
+from starlette.datastructures import MutableHeaders
+
+from app.api.admin import is_admin_token
+from app.utils.profiling import RequestTimings, begin_request, end_request
+
+# X-Debug header / ?debug= values: timings only, or timings plus a profile
+DEBUG_MODES = ("timing", "cprofile", "sample")
+
+
+class DebugMiddleware:
+    """
+    Per-request diagnostics for admins, without redeploying.
+
+    A request with `X-Debug: timing` (or `?debug=timing`) and a valid
+    X-Admin-Token gets a Server-Timing header splitting its time into
+    validate / handler / io / csv / convert / encode phases. `cprofile`
+    and `sample` additionally profile the endpoint into PROFILE_DIR (a
+    pstats .prof file, or folded stacks for a flame graph) and name the
+    file in X-Profile-File. Other requests pass through untouched.
+
+    Timings stop when the headers go out, so for streamed responses
+    (format=ndjson) they cover only the work done before the first byte.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        mode = self._mode(scope) if scope["type"] == "http" else None
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings(profile=None if mode == "timing" else mode)
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timings.header(time.perf_counter() - started))
+                if timings.profile_file:
+                    headers.append("X-Profile-File", timings.profile_file)
+            await send(message)
+
+        token = begin_request(timings)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            end_request(token)
+
+    @staticmethod
+    def _mode(scope):
+        headers = dict(scope["headers"])
+        mode = headers.get(b"x-debug", b"").decode("latin-1")
+        if not mode and b"debug=" in scope.get("query_string", b""):
+            mode = parse_qs(scope["query_string"].decode("latin-1")).get("debug", [""])[0]
+        if mode not in DEBUG_MODES:
+            return None
+        if not is_admin_token(headers.get(b"x-admin-token", b"").decode("latin-1")):
+            return None
+        return mode
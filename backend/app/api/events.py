@@ -0,0 +1,92 @@
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from app.config import EVENT_HEARTBEAT_SECONDS
+from app.services.event_hub import TOPICS, event_hub
+from app.utils.profiling import TimedRoute
+
+router = APIRouter(prefix="/events", tags=["Events"], route_class=TimedRoute)
+
+
+def _parse_topics(topics: str | None):
+    if not topics:
+        return TOPICS
+    wanted = tuple(t.strip() for t in topics.split(",") if t.strip())
+    unknown = set(wanted) - set(TOPICS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown topics: {', '.join(sorted(unknown))}")
+    return wanted
+
+
+@router.get("")
+async def stream_events(request: Request, topics: str | None = Query(None)):
+    """
+    Server-Sent Events feed of new readings, predictions and notifications.
+    `topics` is a comma-separated subset of reading,prediction,notification.
+    """
+    sub = event_hub.subscribe(_parse_topics(topics))
+
+    async def body():
+        try:
+            yield b"retry: 3000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(sub.get(), EVENT_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield b": keep-alive\n\n"
+                    continue
+                if event is None:
+                    return  # evicted as a slow consumer
+                event_id, topic, data = event
+                yield f"id: {event_id}\nevent: {topic}\ndata: {data}\n\n".encode("utf-8")
+        finally:
+            event_hub.unsubscribe(sub)
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def events_websocket(websocket: WebSocket, topics: str | None = None):
+    """WebSocket variant of /events; each message is {"id", "topic", "data"}."""
+    try:
+        wanted = _parse_topics(topics)
+    except HTTPException as e:
+        await websocket.close(code=1008, reason=e.detail)
+        return
+
+    await websocket.accept()
+    sub = event_hub.subscribe(wanted)
+
+    async def pump():
+        while True:
+            event = await sub.get()
+            if event is None:
+                await websocket.close(code=1013, reason="Too slow, reconnect")
+                return
+            event_id, topic, data = event
+            await websocket.send_text(f'{{"id":{event_id},"topic":"{topic}","data":{data}}}')
+
+    async def watch():
+        # notice a client that goes away while no events are flowing
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    tasks = {asyncio.create_task(pump()), asyncio.create_task(watch())}
+    try:
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        for task in done:
+            error = task.exception()
+            if error is not None and not isinstance(error, WebSocketDisconnect):
+                raise error
+    finally:
+        event_hub.unsubscribe(sub)
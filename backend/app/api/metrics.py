@@ -0,0 +1,118 @@
+import time
+from datetime import datetime
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.services import prediction_generator
+from app.services.event_hub import event_hub
+from app.services.leader import leader_election
+from app.services.response_cache import response_cache
+from app.services.metrics import http_in_flight, http_requests, http_response_size, registry
+from app.services.scheduler import scheduler
+from app.services.sensor_store import sensor_store, to_epoch
+from app.storage import storage
+from app.utils.profiling import TimedRoute
+
+router = APIRouter(tags=["Metrics"], route_class=TimedRoute)
+
+# Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """
+    This worker's metrics in Prometheus text format. With several uvicorn
+    workers each scrape sees one of them; the generator gauges are only
+    meaningful on the leader (see generator_leader).
+    """
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
+
+
+class MetricsMiddleware:
+    """
+    Records latency (until the last body byte, so streamed responses count
+    in full), status and body size of every HTTP request, labelled by the
+    route template rather than the raw path.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        http_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_in_flight.dec()
+            route = scope.get("route")
+            # unmatched paths share one label so scanners can't blow up cardinality
+            path = getattr(route, "path", "unmatched")
+            method = scope["method"]
+            http_requests.labels(method, path, status).observe(time.perf_counter() - started)
+            http_response_size.labels(method, path).observe(size)
+
+
+# ===============================
+# SCRAPE-TIME GAUGES
+# ===============================
+
+def _job_stat(key):
+    return lambda: {(name,): stats[key] for name, stats in scheduler.stats().items()}
+
+
+def _sensor_lag():
+    newest = sensor_store.newest()
+    if newest is None:
+        return None
+    # stored timestamps are naive local wall-clock time
+    return to_epoch(datetime.now()) - newest
+
+
+def _writer_backlog():
+    # CSV only: appends queued for the group-commit writer thread
+    writer = getattr(storage, "writer", None)
+    return None if writer is None else writer.pending()
+
+
+registry.collected("job_runs_total", "Completed background job runs.", _job_stat("runs"), ["job"], kind="counter")
+registry.collected("job_failures_total", "Background job runs that raised.", _job_stat("failures"), ["job"], kind="counter")
+registry.collected(
+    "job_skipped_ticks_total", "Ticks dropped because a run overran its slot.",
+    _job_stat("skippedTicks"), ["job"], kind="counter",
+)
+registry.collected("generator_leader", "1 if this worker runs the generators.", lambda: int(leader_election.is_leader))
+registry.collected("sensor_lag_seconds", "Age of the newest sensor reading.", _sensor_lag)
+registry.collected(
+    "prediction_backlog_rows", "Readings not yet scored by the prediction job.",
+    prediction_generator.backlog,
+)
+registry.collected("storage_writer_pending", "Appends queued for the CSV writer.", _writer_backlog)
+registry.collected(
+    "storage_file_size_bytes", "Size of each data file.",
+    lambda: {(name,): size for name, size in storage.file_sizes().items()}, ["file"],
+)
+registry.collected("event_subscribers", "Connected SSE/WebSocket clients.", lambda: event_hub.subscriber_count)
+registry.collected(
+    "event_evictions_total", "Slow event clients disconnected.",
+    lambda: event_hub.evictions, kind="counter",
+)
+registry.collected("response_cache_bytes", "Bytes of cached response bodies.", lambda: response_cache.size_bytes)
+registry.collected("response_cache_entries", "Cached response bodies.", lambda: len(response_cache))
@@ -1,6 +1,8 @@
 from fastapi import APIRouter
 
-router = APIRouter(prefix="/mine-info", tags=["Mine Info"])
+from app.utils.profiling import TimedRoute
+
+router = APIRouter(prefix="/mine-info", tags=["Mine Info"], route_class=TimedRoute)
 
 @router.get("")
 def get_mine_info():
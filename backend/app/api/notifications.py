@@ -1,31 +1,67 @@
-from fastapi import APIRouter
-import csv
-from pathlib import Path
+from fastapi import APIRouter, Query, Request
 from datetime import datetime
 
-router = APIRouter(prefix="/notifications", tags=["Notifications"])
+from app.services.event_hub import event_hub
+from app.services.metrics import notifications_sent
+from app.services.notification_index import notification_index
+from app.services.response_cache import response_cache
+from app.storage import storage
+from app.utils.profiling import TimedRoute
+from app.utils.streaming import ndjson_response
 
-FILE = Path("data/notifications.csv")
-FILE.parent.mkdir(exist_ok=True)
+router = APIRouter(prefix="/notifications", tags=["Notifications"], route_class=TimedRoute)
 
-def ensure_file():
-    if not FILE.exists():
-        with open(FILE, "w", newline="", encoding="utf-8") as f:
-            csv.writer(f).writerow(["timestamp", "level", "message"])
+
+def _iso(value: datetime | None):
+    return None if value is None else value.replace(tzinfo=None).isoformat()
 
 
 @router.get("")
-def get_notifications():
-    ensure_file()
-    with open(FILE, newline="", encoding="utf-8") as f:
-        return list(csv.DictReader(f))
+async def get_notifications(
+    request: Request,
+    level: str | None = None,
+    from_: datetime | None = Query(None, alias="from"),
+    to: datetime | None = None,
+    before: int | None = Query(None, ge=1),
+    limit: int | None = Query(None, ge=1),
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+):
+    """
+    Notifications, oldest first, each with its `id` and `read` flag.
+
+    Filter by `level` and a `from`/`to` time range (inclusive). `limit`
+    keeps the newest matches only; to page further back pass the
+    smallest id you have as `before`. `format=ndjson` streams one per
+    line. JSON responses are cached until a notification or read mark
+    is added, and identical concurrent requests share one build.
+    """
+    filters = dict(level=level, start=_iso(from_), end=_iso(to), before=before, limit=limit)
+    if format == "ndjson":
+        return ndjson_response(notification_index.iter_query(**filters))
+    return await response_cache.respond_shared(
+        request, notification_index.version, lambda: notification_index.query(**filters),
+    )
+
+
+@router.get("/summary")
+def get_notification_summary(since: datetime | None = None):
+    """
+    Counts for badges: totals since `since` (default: all time) and
+    unread counts, overall and per level. Served from memory.
+    """
+    return notification_index.summary(since=_iso(since))
+
+
+@router.post("/read")
+def mark_notifications_read(up_to: int | None = Query(None, alias="upTo", ge=0)):
+    """Mark notifications up to id `upTo` (default: all of them) as read."""
+    notification_index.mark_read(up_to)
+    return notification_index.summary()
 
 
 def push_notification(level: str, message: str):
-    ensure_file()
-    with open(FILE, "a", newline="", encoding="utf-8") as f:
-        csv.writer(f).writerow([
-            datetime.now().isoformat(),
-            level,
-            message
-        ])
+    timestamp = datetime.now().isoformat()
+    entry = notification_index.add(timestamp, level, message)
+    storage.append_notification(timestamp, level, message)
+    notifications_sent.labels(level).inc()
+    event_hub.publish("notification", entry)
@@ -1,14 +1,12 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
-from pathlib import Path
-import csv
 
-router = APIRouter(prefix="/predict", tags=["Prediction"])
+from app.services.response_cache import response_cache
+from app.services.snapshot import snapshot
+from app.storage import storage
+from app.utils.profiling import TimedRoute
 
-# __file__ = backend/app/api/predict.py
-BASE_DIR = Path(__file__).resolve().parent.parent.parent  # backend/
-DATA_DIR = BASE_DIR / "data"                              # backend/data
-PRED_FILE = DATA_DIR / "prediction.csv"
+router = APIRouter(prefix="/predict", tags=["Prediction"], route_class=TimedRoute)
 
 
 class PredictionResponse(BaseModel):
@@ -24,25 +22,23 @@ class PredictionResponse(BaseModel):
 
 
 @router.get("", response_model=PredictionResponse)
-def get_prediction():
-    if not PRED_FILE.exists():
+def get_prediction(request: Request):
+    last = snapshot.latest_prediction() or storage.latest_prediction()
+    if last is None:
         raise HTTPException(status_code=404, detail="No predictions yet")
 
-    with open(PRED_FILE, newline="", encoding="utf-8") as f:
-        rows = list(csv.DictReader(f))
-        if not rows:
-            raise HTTPException(status_code=404, detail="No predictions yet")
-
-        last = rows[-1]
-
-    return PredictionResponse(
-        timestamp=last["timestamp"],
-        probability=float(last["probability"]),
-        next3Hours=last["next3Hours"],
-        next6Hours=last["next6Hours"],
-        next12Hours=last["next12Hours"],
-        next24Hours=last["next24Hours"],
-        locationX=float(last["locationX"]),
-        locationY=float(last["locationY"]),
-        locationZ=float(last["locationZ"]),
-    )
+    def build():
+        return PredictionResponse(
+            timestamp=last["timestamp"],
+            probability=float(last["probability"]),
+            next3Hours=last["next3Hours"],
+            next6Hours=last["next6Hours"],
+            next12Hours=last["next12Hours"],
+            next24Hours=last["next24Hours"],
+            locationX=float(last["locationX"]),
+            locationY=float(last["locationY"]),
+            locationZ=float(last["locationZ"]),
+        )
+
+    # the prediction itself is the version: polls between ticks get a 304
+    return response_cache.respond(request, tuple(last.values()), build)
@@ -1,14 +1,27 @@
-from fastapi import APIRouter
-from pathlib import Path
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 import csv
 from datetime import datetime
+from itertools import islice
 
-router = APIRouter(prefix="/sensors", tags=["Sensors"])
+import numpy as np
 
-BASE_DIR = Path(__file__).resolve().parent.parent.parent
-DATA_DIR = BASE_DIR / "data"
+from app.api.admin import require_admin
+from app.config import DATA_DIR
+from app.schemas.sensor import SensorIngest
+from app.services.downsample import METHODS, downsample
+from app.services.leader import leader_election
+from app.services.response_cache import response_cache
+from app.services.sensor_generator import ingest_rows
+from app.services.sensor_store import sensor_store, to_epoch
+from app.services.snapshot import snapshot
+from app.storage import storage
+from app.storage.base import CHANNELS, SENSOR_TS_FORMAT
+from app.utils.columnar import COLUMNS_BINARY_MEDIA_TYPE, encode_columns_binary, encode_columns_json
+from app.utils.profiling import TimedRoute, phase
+from app.utils.streaming import ndjson_response
+
+router = APIRouter(prefix="/sensors", tags=["Sensors"], route_class=TimedRoute)
 
-SENSORS_FILE = DATA_DIR / "sensors.csv"
 SENSOR_HEALTH_FILE = DATA_DIR / "sensor_health.csv"
 
 
@@ -19,54 +32,237 @@ def parse_float(value):
         return None
 
 
-def parse_timestamp(value):
-    try:
-        return datetime.strptime(value, "%Y-%m-%d %H:%M:%S").isoformat()
-    except Exception:
+@router.get("/readings")
+async def get_sensor_readings(
+    request: Request,
+    from_: datetime | None = Query(None, alias="from"),
+    to: datetime | None = None,
+    limit: int | None = Query(None, ge=1),
+    after: datetime | None = None,
+    after_seen: int | None = Query(None, ge=0),
+    format: str = Query("json", pattern="^(json|ndjson|columns|binary)$"),
+    float32: bool = False,
+):
+    """
+    Sensor readings, oldest first.
+
+    `from`/`to` bound the time range (inclusive), `after` is a cursor:
+    pass the timestamp of the last reading you already have to get the
+    next page, and in `after_seen` how many readings with exactly that
+    timestamp you have, so a page that ends partway through one second
+    resumes with the rest of it (without `after_seen`, every reading at
+    `after` counts as seen). `limit` caps the page size. Without any of
+    them the full history is returned.
+
+    `format=ndjson` streams one reading per line instead of building the
+    whole list, so memory stays flat and the first bytes arrive at once.
+
+    For charts, `format=columns` returns one array per field instead,
+    `{"timestamp": [...], "accelerometerX": [...], ...}`, with timestamps
+    as epoch milliseconds of the (naive) stored times. `format=binary`
+    sends the same columns as raw little-endian arrays (layout in
+    app.utils.columnar). `float32=true` rounds their values to float32.
+
+    All but ndjson are cached until a reading is added, and identical
+    concurrent requests share one build (see response_cache).
+    """
+    if format in ("columns", "binary"):
+        def build():
+            t, cols = _window_columns(from_, to, after, limit, after_seen)
+            with phase("encode"):
+                if format == "binary":
+                    return encode_columns_binary(t, cols, float32)
+                return encode_columns_json(t, cols, CHANNELS, float32)
+
+        media_type = COLUMNS_BINARY_MEDIA_TYPE if format == "binary" else "application/json"
+        return await response_cache.respond_shared(request, _readings_version, build, media_type)
+
+    readings = _iter_readings(from_, to, after, limit, after_seen)
+    if format == "ndjson":
+        return ndjson_response(readings)
+    return await response_cache.respond_shared(request, _readings_version, lambda: list(readings))
+
+
+def _readings_version():
+    # taken before building, so a reading that lands meanwhile forces a rebuild
+    return sensor_store.seq, storage.readings_version()
+
+
+def _resume(from_, after, after_seen):
+    """
+    (from, after, readings to skip) for the /readings cursor. With
+    `after_seen`, `after` becomes an inclusive lower bound and the first
+    `after_seen` readings at exactly `after` are to be skipped.
+    """
+    if after is None or after_seen is None:
+        return from_, after, 0
+    if from_ is not None and to_epoch(from_) > to_epoch(after):
+        return from_, None, 0
+    return after, None, after_seen
+
+
+def _store_window(from_, to, after, limit, skip):
+    """
+    (t, cols) from the in-memory store, skipping `skip` readings at
+    exactly `from_` and capped at `limit`; None if the store no longer
+    holds the start of the range.
+    """
+    start = None if from_ is None else to_epoch(from_)
+    if not sensor_store.covers(start):
         return None
+    with phase("store"):
+        t, cols = sensor_store.window(
+            start=start,
+            end=None if to is None else to_epoch(to),
+            after=None if after is None else to_epoch(after),
+        )
+    if skip:
+        # the window starts with the readings at exactly `from_`
+        skip = min(skip, int(np.searchsorted(t, start, side="right")))
+        t, cols = t[skip:], cols[:, skip:]
+    if limit is not None:
+        t, cols = t[:limit], cols[:, :limit]
+    return t, cols
 
 
-@router.get("/readings")
-def get_sensor_readings():
-    if not SENSORS_FILE.exists():
-        return []
+def _stored_readings(from_, to, after, limit, skip):
+    """The same readings as _store_window(), lazily from storage."""
+    readings = storage.iter_readings(from_, to, after, None if limit is None else limit + skip)
+    if skip:
+        start = to_epoch(from_)
+        readings = (
+            reading for i, reading in enumerate(readings)
+            if i >= skip or to_epoch(reading["timestamp"]) != start
+        )
+    return islice(readings, limit)
 
-    data = []
 
-    with open(SENSORS_FILE, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
+def _iter_readings(from_=None, to=None, after=None, limit=None, after_seen=None, chunk=1000):
+    from_, after, skip = _resume(from_, after, after_seen)
+    window = _store_window(from_, to, after, limit, skip)
+    if window is None:
+        yield from _stored_readings(from_, to, after, limit, skip)
+        return
 
-        for row in reader:
-            timestamp = parse_timestamp(row.get("Timestamp"))
+    t, cols = window
+    names = list(CHANNELS)
+    for i in range(0, len(t), chunk):
+        stamps = np.datetime_as_string(t[i:i + chunk].astype("datetime64[s]")).tolist()
+        for ts, values in zip(stamps, cols[:, i:i + chunk].T.tolist()):
+            yield {"timestamp": ts, **dict(zip(names, values))}
 
-            if not timestamp:
-                continue
 
-            ax = parse_float(row.get("Accelerometer X (g)"))
-            ay = parse_float(row.get("Accelerometer Y (g)"))
-            az = parse_float(row.get("Accelerometer Z (g)"))
-            inc = parse_float(row.get("Inclinometer (deg)"))
-            ext = parse_float(row.get("Extensometer (mm)"))
-            piezo = parse_float(row.get("Piezometer (kPa)"))
+@router.post("/readings", dependencies=[Depends(require_admin)])
+def ingest_readings(readings: list[SensorIngest]):
+    """
+    Append externally produced readings (admin only), e.g. from the load
+    generator. They go through the same path as the live generator.
 
-            if None in (ax, ay, az, inc, ext, piezo):
-                continue
+    Only the generator leader writes; other workers answer 503 so the
+    client retries. A batch older than the newest stored reading is
+    rejected with 409.
+    """
+    if not leader_election.is_leader:
+        raise HTTPException(
+            status_code=503,
+            detail="This worker does not write readings",
+            headers={"Retry-After": "1"},
+        )
 
-            data.append({
-                "timestamp": timestamp,
-                "accelerometerX": ax,
-                "accelerometerY": ay,
-                "accelerometerZ": az,
-                "inclinometer": inc,
-                "extensometer": ext,
-                "piezometer": piezo,
-            })
+    rows = sorted((
+        [
+            r.timestamp.replace(tzinfo=None).strftime(SENSOR_TS_FORMAT),
+            *(getattr(r, name) for name in CHANNELS),
+            r.eventType,
+        ]
+        for r in readings
+    ), key=lambda row: row[0])
+    try:
+        ingest_rows(rows)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"accepted": len(rows)}
 
-    return data
+
+@router.get("/readings/downsampled")
+def get_downsampled_readings(
+    from_: datetime | None = Query(None, alias="from"),
+    to: datetime | None = None,
+    points: int = Query(500, ge=10, le=10000),
+    method: str = Query("lttb", pattern="^(" + "|".join(METHODS) + ")$"),
+):
+    """
+    At most `points` points per channel for charting a time range.
+
+    `lttb` keeps the visual shape, `minmax` keeps every bucket's extremes
+    (spikes are never lost), `mean` averages each bucket.
+    """
+    t, cols = _window_columns(from_, to)
+
+    series = {}
+    for name, y in zip(CHANNELS, cols):
+        ts, ys = downsample(t, y, points, method)
+        series[name] = {
+            "timestamps": np.datetime_as_string(ts.astype("datetime64[s]")).tolist(),
+            "values": ys.tolist(),
+        }
+
+    return {"method": method, "points": points, "sourcePoints": len(t), "series": series}
+
+
+def _window_columns(from_=None, to=None, after=None, limit=None, after_seen=None):
+    """
+    Readings in a time range as (int64 epoch seconds, channels x n array),
+    with the same `after`, `after_seen` and `limit` as /readings.
+
+    Served straight from the in-memory store when it still holds the
+    start of the range; older ranges are read from storage.
+    """
+    from_, after, skip = _resume(from_, after, after_seen)
+    window = _store_window(from_, to, after, limit, skip)
+    if window is not None:
+        return window
+
+    times = []
+    values = []
+    for reading in _stored_readings(from_, to, after, limit, skip):
+        times.append(reading["timestamp"])
+        values.append([reading[name] for name in CHANNELS])
+
+    t = np.array(times, dtype="datetime64[s]").astype(np.int64)
+    matrix = np.array(values, dtype=np.float64).reshape(len(values), len(CHANNELS))
+    return t, matrix.T
+
+
+@router.get("/latest")
+def get_latest_reading():
+    """
+    The newest reading, from the shared snapshot (microseconds, no file
+    access); falls back to the newest stored reading.
+    """
+    reading = snapshot.latest_reading()
+    if reading is None:
+        reading = next(storage.iter_last_readings(1), None)
+    if reading is None:
+        raise HTTPException(status_code=404, detail="No readings yet")
+    return reading
+
+
+def _health_version():
+    try:
+        st = SENSOR_HEALTH_FILE.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
 
 
 @router.get("/health")
-def get_sensor_health():
+def get_sensor_health(request: Request):
+    """Battery and accuracy per sensor; cached until the file changes."""
+    return response_cache.respond(request, _health_version(), _read_sensor_health)
+
+
+def _read_sensor_health():
     if not SENSOR_HEALTH_FILE.exists():
         return []
 
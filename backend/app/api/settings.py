@@ -1,7 +1,8 @@
 from fastapi import APIRouter
 from app.schemas.settings import AppSettings
+from app.utils.profiling import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 @router.post("/settings")
 def save_settings(settings: AppSettings):
@@ -1,13 +1,10 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, EmailStr
-from pathlib import Path
-import csv
 
-router = APIRouter()
+from app.services.user_directory import DuplicateEmailError, user_directory
+from app.utils.profiling import TimedRoute
 
-BASE_DIR = Path(__file__).resolve().parent.parent.parent  # backend/
-DATA_DIR = BASE_DIR / "data"
-USERS_FILE = DATA_DIR / "users.csv"
+router = APIRouter(route_class=TimedRoute)
 
 
 class RegisterUser(BaseModel):
@@ -20,25 +17,10 @@ class RegisterUser(BaseModel):
 
 @router.post("/register")
 def register_user(user: RegisterUser):
-    DATA_DIR.mkdir(exist_ok=True)
-    write_header = not USERS_FILE.exists()
-
     try:
-        with open(USERS_FILE, "a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            if write_header:
-                writer.writerow(
-                    ["firstName", "lastName", "email", "password", "employeeId"]
-                )
-            writer.writerow(
-                [
-                    user.firstName,
-                    user.lastName,
-                    user.email,
-                    user.password,
-                    user.employeeId,
-                ]
-            )
+        user_directory.register(user.model_dump())
+    except DuplicateEmailError:
+        raise HTTPException(status_code=409, detail="Email already registered")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to write user: {e}")
 
@@ -0,0 +1,142 @@
+import os
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent  # backend/
+DATA_DIR = Path(os.getenv("DATA_DIR", BASE_DIR / "data"))
+
+# ===============================
+# STORAGE BACKEND
+# ===============================
+
+# "csv" (append-only files in DATA_DIR) or "sqlite" (indexed, WAL mode)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "csv")
+
+SQLITE_PATH = Path(os.getenv("SQLITE_PATH", DATA_DIR / "terra_watchers.db"))
+
+# ===============================
+# CSV WRITER (GROUP COMMIT)
+# ===============================
+
+# queued appends are written together once this many rows are pending...
+WRITER_BATCH_ROWS = int(os.getenv("WRITER_BATCH_ROWS", "1000"))
+
+# ...or this many seconds after the oldest one was queued
+WRITER_FLUSH_SECONDS = float(os.getenv("WRITER_FLUSH_SECONDS", "0.1"))
+
+# fsync every batch before readers may see it
+WRITER_FSYNC = os.getenv("WRITER_FSYNC", "false").lower() in ("1", "true", "yes")
+
+# ===============================
+# BACKGROUND JOBS (SCHEDULER)
+# ===============================
+
+# fixed-rate periods of the simulated generators
+SENSOR_INTERVAL_SECONDS = float(os.getenv("SENSOR_INTERVAL_SECONDS", "5"))
+PREDICTION_INTERVAL_SECONDS = float(os.getenv("PREDICTION_INTERVAL_SECONDS", "5"))
+
+# threads available to blocking job work (each job runs at most once at a time)
+SCHEDULER_WORKERS = int(os.getenv("SCHEDULER_WORKERS", "4"))
+
+# on shutdown, how long to wait for running jobs before giving up
+SCHEDULER_SHUTDOWN_SECONDS = float(os.getenv("SCHEDULER_SHUTDOWN_SECONDS", "10"))
+
+# ===============================
+# MULTI-WORKER (LEADER ELECTION)
+# ===============================
+
+# the worker holding an exclusive lock on this file runs the generators
+LEADER_LOCK_FILE = Path(os.getenv("LEADER_LOCK_FILE", DATA_DIR / "generators.lock"))
+
+# how often followers retry the lock (bounds failover time)
+LEADER_RETRY_SECONDS = float(os.getenv("LEADER_RETRY_SECONDS", "2"))
+
+# how often followers pull new readings/predictions/notifications
+FOLLOWER_SYNC_SECONDS = float(os.getenv("FOLLOWER_SYNC_SECONDS", "1"))
+
+# fixed-layout mmap file holding the latest reading and prediction,
+# written by the leader and read by every worker
+SNAPSHOT_FILE = Path(os.getenv("SNAPSHOT_FILE", DATA_DIR / "latest.snapshot"))
+
+# ===============================
+# IN-MEMORY SENSOR STORE
+# ===============================
+
+# Number of most recent readings kept in RAM. Each row costs
+# 2 * (8 + 6 * 8) = 112 bytes (the ring buffer is mirrored), so the
+# default of 100k rows uses about 11 MB.
+SENSOR_STORE_CAPACITY = int(os.getenv("SENSOR_STORE_CAPACITY", "100000"))
+
+# ===============================
+# LIVE EVENTS (SSE / WEBSOCKET)
+# ===============================
+
+# events buffered per client before it counts as a slow consumer
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "100"))
+
+# seconds between SSE keep-alive comments
+EVENT_HEARTBEAT_SECONDS = float(os.getenv("EVENT_HEARTBEAT_SECONDS", "15"))
+
+# ===============================
+# RISK NOTIFICATIONS
+# ===============================
+
+# percentage points the probability must fall below a level's threshold
+# before the level is considered left (stops flapping at the boundary)
+NOTIFY_HYSTERESIS = float(os.getenv("NOTIFY_HYSTERESIS", "5"))
+
+# minimum seconds between alerts; escalations are never held back
+NOTIFY_COOLDOWN_SECONDS = float(os.getenv("NOTIFY_COOLDOWN_SECONDS", "300"))
+
+# while a warning/critical level persists, one "still" reminder per interval
+NOTIFY_REMIND_SECONDS = float(os.getenv("NOTIFY_REMIND_SECONDS", "3600"))
+
+# read watermark for /notifications (id of the newest notification seen)
+NOTIFICATIONS_READ_FILE = Path(
+    os.getenv("NOTIFICATIONS_READ_FILE", DATA_DIR / "notifications_read.json")
+)
+
+# ===============================
+# MODEL ARTIFACT
+# ===============================
+
+# produced by `python -m app.models.train`
+MODEL_PATH = Path(os.getenv("MODEL_PATH", DATA_DIR / "rockfall_rf.joblib"))
+
+# ===============================
+# ADMIN ENDPOINTS
+# ===============================
+
+# shared secret for /admin/* (X-Admin-Token header); unset disables them
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+# ===============================
+# LOGGING
+# ===============================
+
+# DEBUG shows per-tick generator details; INFO and up for production
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+# "text" (key=value, for humans) or "json" (one object per line, for log shippers)
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+
+# ===============================
+# REQUEST PROFILING
+# ===============================
+
+# where `X-Debug: cprofile|sample` requests leave their profiles
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", DATA_DIR / "profiles"))
+
+# stack sampling period for `X-Debug: sample`
+PROFILE_SAMPLE_SECONDS = float(os.getenv("PROFILE_SAMPLE_SECONDS", "0.001"))
+
+# ===============================
+# RESPONSE CACHE
+# ===============================
+
+# serialized GET bodies kept per worker, reused until their data changes
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 2**20)))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+
+# identical concurrent requests share one computation; its result is
+# handed to further identical requests for this long after it finishes
+COALESCE_TTL_SECONDS = float(os.getenv("COALESCE_TTL_SECONDS", "1.0"))
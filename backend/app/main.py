@@ -1,13 +1,62 @@
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+
 import pandas as pd
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api import sensors, predict, mine_info, users, settings, auth, notifications
-from app.services.sensor_generator import start_sensor_generator
-from app.services.prediction_generator import start_prediction_generator
+from app.api import sensors, predict, mine_info, users, settings, auth, notifications, events, admin, metrics
+from app.api.debug import DebugMiddleware
+from app.config import (
+    FOLLOWER_SYNC_SECONDS,
+    LEADER_RETRY_SECONDS,
+    PREDICTION_INTERVAL_SECONDS,
+    SENSOR_INTERVAL_SECONDS,
+)
+from app.services.follower_sync import follower_sync
+from app.services.leader import leader_election
+from app.services.scheduler import scheduler
+from app.services.sensor_generator import run_sensor_tick
+from app.services.prediction_generator import run_prediction_tick
+from app.services.sensor_store import CHANNELS, sensor_store
+from app.storage import storage
+from app.utils.log import configure_logging
+
+configure_logging()
+logger = logging.getLogger(__name__)
+
+
+# 🔥 background generators run in exactly one worker (the leader);
+# the other workers serve reads and follow what the leader stores
+def campaign():
+    if not leader_election.try_acquire():
+        return
+    logger.info("👑 this worker is the generator leader", extra={"pid": os.getpid()})
+    scheduler.pause("leader-election")
+    scheduler.pause("follower-sync")
+    follower_sync.sync_once()  # last catch-up before we start writing
+    scheduler.resume("sensor-generator")
+    scheduler.resume("prediction")
+
 
+scheduler.add_job("leader-election", campaign, LEADER_RETRY_SECONDS)
+scheduler.add_job("follower-sync", follower_sync.sync_once, FOLLOWER_SYNC_SECONDS)
+scheduler.add_job("sensor-generator", run_sensor_tick, SENSOR_INTERVAL_SECONDS, enabled=False)
+scheduler.add_job("prediction", run_prediction_tick, PREDICTION_INTERVAL_SECONDS, enabled=False)
 
-app = FastAPI(title="Terra Watchers API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await scheduler.start()
+    yield
+    await scheduler.stop()
+    # pending CSV appends must reach disk before the process exits
+    await asyncio.to_thread(storage.flush)
+
+
+app = FastAPI(title="Terra Watchers API", lifespan=lifespan)
 
 # CORS (required for frontend)
 app.add_middleware(
@@ -17,6 +66,10 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Server-Timing / profiling for admins that ask for it (X-Debug)
+app.add_middleware(DebugMiddleware)
+# outermost, so it times everything including CORS
+app.add_middleware(metrics.MetricsMiddleware)
 
 # REGISTER ROUTERS
 app.include_router(sensors.router)
@@ -26,16 +79,15 @@ app.include_router(users.router)
 app.include_router(settings.router)
 app.include_router(auth.router)          # /login, /register
 app.include_router(notifications.router) # /notifications  ✅
-
-# 🔥 start background generators when app imports
-start_sensor_generator()
-start_prediction_generator()
-
-CSV_PATH = "data/sensors.csv"
+app.include_router(events.router)        # /events (SSE), /events/ws
+app.include_router(admin.router)         # /admin/* (X-Admin-Token)
+app.include_router(metrics.router)       # /metrics (Prometheus)
 
 def load_csv():
-    df = pd.read_csv(CSV_PATH)
-    df["Timestamp"] = pd.to_datetime(df["Timestamp"])
+    # built from the in-memory store instead of re-parsing sensors.csv
+    t, cols = sensor_store.window()
+    df = pd.DataFrame(dict(zip(CHANNELS.values(), cols)))
+    df.insert(0, "Timestamp", pd.to_datetime(t, unit="s"))
     return df
 
 @app.get("/")
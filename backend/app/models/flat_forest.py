@@ -0,0 +1,102 @@
+import numpy as np
+
+# up to this many rows, stepping every tree in lockstep beats compaction
+SMALL_BATCH = 8
+
+
+class FlatForest:
+    """
+    A fitted sklearn tree ensemble packed into flat NumPy arrays
+    (feature, threshold, left, right, value) for low-latency inference.
+
+    All trees are evaluated together: every step moves each (row, tree)
+    cursor one level down with a handful of vectorized gathers, so scoring
+    one row costs `max_depth` small NumPy ops instead of sklearn's
+    per-call validation, joblib dispatch and per-tree Python loop.
+    Leaves point to themselves, so cursors that reach a leaf early just
+    stay there.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, max_depth):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        # children[2 * node + went_right], so a step is a single gather
+        self.children = np.column_stack([left, right]).ravel()
+        self.is_leaf = left == np.arange(len(left))
+
+    @classmethod
+    def from_sklearn(cls, forest) -> "FlatForest":
+        """Pack a fitted RandomForestRegressor (single output)."""
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            n = tree.node_count
+            ids = np.arange(offset, offset + n)
+            is_leaf = tree.children_left < 0
+
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            lefts.append(np.where(is_leaf, ids, tree.children_left + offset))
+            rights.append(np.where(is_leaf, ids, tree.children_right + offset))
+            values.append(tree.value[:, 0, 0])
+            roots.append(offset)
+
+            max_depth = max(max_depth, tree.max_depth)
+            offset += n
+
+        return cls(
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            left=np.concatenate(lefts).astype(np.intp),
+            right=np.concatenate(rights).astype(np.intp),
+            value=np.concatenate(values).astype(np.float64),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max_depth,
+        )
+
+    def predict(self, X) -> np.ndarray:
+        """Mean tree output for each row of X (shape (n_rows, n_features))."""
+        # sklearn compares float32 inputs against its thresholds; do the same
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        if X.ndim == 1:
+            X = X[None, :]
+
+        n_rows, n_features = X.shape
+        flat_x = X.ravel()
+        if n_rows <= SMALL_BATCH:
+            return self._predict_lockstep(flat_x, n_rows, n_features)
+        return self._predict_compacting(flat_x, n_rows, n_features)
+
+    def _predict_lockstep(self, flat_x, n_rows, n_features):
+        # few cursors: cheapest to step all of them max_depth times
+        row_base = (np.arange(n_rows) * n_features)[:, None]
+        node = np.repeat(self.roots[None, :], n_rows, axis=0)
+        for _ in range(self.max_depth):
+            x = flat_x.take(row_base + self.feature.take(node))
+            node = self.children.take(2 * node + (x > self.threshold.take(node)))
+        return self.value.take(node).mean(axis=1)
+
+    def _predict_compacting(self, flat_x, n_rows, n_features):
+        # many cursors: drop the ones that reached a leaf after every step,
+        # so the work follows the real path lengths, not the deepest tree
+        n_trees = len(self.roots)
+        leaves = np.tile(self.roots, n_rows)
+        active = np.flatnonzero(~self.is_leaf.take(leaves))
+        node = leaves.take(active)
+        x_base = (active // n_trees) * n_features
+        while active.size:
+            x = flat_x.take(x_base + self.feature.take(node))
+            node = self.children.take(2 * node + (x > self.threshold.take(node)))
+            done = self.is_leaf.take(node)
+            if done.any():
+                leaves[active[done]] = node[done]
+                keep = ~done
+                active, node, x_base = active[keep], node[keep], x_base[keep]
+        return self.value.take(leaves).reshape(n_rows, n_trees).mean(axis=1)
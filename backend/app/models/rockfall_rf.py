@@ -1,22 +1,61 @@
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+import joblib
 import numpy as np
+import sklearn
 from sklearn.ensemble import RandomForestRegressor
 
+from app.config import MODEL_PATH
+from app.models.flat_forest import FlatForest
+from app.services.metrics import model_inference, model_rows_scored
+
+logger = logging.getLogger(__name__)
+
+# bump when the training recipe or artifact layout changes
+MODEL_VERSION = 1
+
+# FlatForest wins on small inputs (no per-call overhead); past roughly this
+# many rows sklearn's compiled per-tree loop is faster again
+FLAT_MAX_BATCH = 256
+
+# model input columns, in order
+FEATURES = [
+    "Accelerometer X (g)",
+    "Accelerometer Y (g)",
+    "Accelerometer Z (g)",
+    "Inclinometer (deg)",
+    "Extensometer (mm)",
+    "Piezometer (kPa)",
+]
+
 
 class RockfallRF:
-    def __init__(self):
-        self.model = RandomForestRegressor(
+    def __init__(self, model=None):
+        self.model = model if model is not None else self.train()
+        # fast path used for scoring; self.model stays the source of truth
+        self.flat = FlatForest.from_sklearn(self.model)
+
+    @staticmethod
+    def train(seed: int = 42) -> RandomForestRegressor:
+        model = RandomForestRegressor(
             n_estimators=120,
-            random_state=42,
+            random_state=seed,
         )
 
-        # 🔒 dummy training ONLY ONCE
-        X = np.random.rand(500, 6)
-        y = np.random.rand(500)  # already in [0, 1]
-        self.model.fit(X, y)
+        # 🔒 dummy training, seeded so every run yields the same forest
+        rng = np.random.default_rng(seed)
+        X = rng.random((500, len(FEATURES)))
+        y = rng.random(500)  # already in [0, 1]
+        model.fit(X, y)
+        return model
 
     def predict_probability(self, features):
         """Return probability in [0, 1]."""
-        raw = float(self.model.predict([features])[0])
+        raw = float(self.flat.predict([features])[0])
 
         # ✅ clamp to 0–1
         raw = max(0.0, min(1.0, raw))
@@ -24,6 +63,83 @@ class RockfallRF:
         # keep as 0–1 probability
         return round(raw, 3)
 
+    def predict_probabilities(self, rows):
+        """Score many feature rows with one model call."""
+        if len(rows) == 0:
+            return []
+        return self.predict_array(rows).tolist()
+
+    def predict_array(self, rows) -> np.ndarray:
+        """Like predict_probabilities, but returns a NumPy array."""
+        started = time.perf_counter()
+        X = np.asarray(rows, dtype=float)
+        predict = self.flat.predict if len(X) <= FLAT_MAX_BATCH else self.model.predict
+        result = np.round(np.clip(predict(X), 0.0, 1.0), 3)
+        model_inference.observe(time.perf_counter() - started)
+        model_rows_scored.inc(len(X))
+        return result
+
+    # ---------- persistence ----------
+
+    def save(self, path=MODEL_PATH):
+        """Write the model artifact atomically (temp file + rename)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        joblib.dump(
+            {
+                "version": MODEL_VERSION,
+                "features": FEATURES,
+                "sklearn": sklearn.__version__,
+                "model": self.model,
+            },
+            tmp,
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=MODEL_PATH) -> "RockfallRF":
+        """Load an artifact written by save(); raise ValueError if it is stale."""
+        artifact = joblib.load(path)
+        if not isinstance(artifact, dict):
+            raise ValueError(f"{path} is not a RockfallRF artifact")
+        if artifact.get("version") != MODEL_VERSION:
+            raise ValueError(
+                f"model version {artifact.get('version')} != expected {MODEL_VERSION}"
+            )
+        if artifact.get("features") != FEATURES:
+            raise ValueError(f"feature schema mismatch: {artifact.get('features')}")
+        if artifact.get("sklearn") != sklearn.__version__:
+            raise ValueError(
+                f"trained with scikit-learn {artifact.get('sklearn')}, "
+                f"running {sklearn.__version__}"
+            )
+        return cls(artifact["model"])
+
+
+# ✅ lazy singleton (IMPORTANT): nothing is trained at import time
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_model() -> RockfallRF:
+    """
+    Return the shared model, loading the artifact on first use. If it is
+    missing or stale, train once and save it so other workers pick it up.
+    """
+    global _model
+    if _model is not None:
+        return _model
 
-# ✅ singleton (IMPORTANT)
-rf_model = RockfallRF()
+    with _model_lock:
+        if _model is None:
+            try:
+                _model = RockfallRF.load(MODEL_PATH)
+            except Exception as e:
+                logger.warning("model artifact unusable, retraining", extra={"error": str(e)})
+                _model = RockfallRF()
+                try:
+                    _model.save(MODEL_PATH)
+                except OSError as e:
+                    logger.warning("could not save model artifact", extra={"error": str(e)})
+    return _model
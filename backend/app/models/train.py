@@ -0,0 +1,29 @@
+"""
+Train the RockfallRF model and write its artifact.
+
+    python -m app.models.train [--out PATH] [--seed N]
+
+Run it once per deploy (or after changing the training recipe) so every
+worker loads the same model instead of training its own.
+"""
+import argparse
+import time
+
+from app.config import MODEL_PATH
+from app.models.rockfall_rf import RockfallRF
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--out", default=MODEL_PATH, help=f"artifact path (default: {MODEL_PATH})")
+    parser.add_argument("--seed", type=int, default=42, help="training seed")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    model = RockfallRF(RockfallRF.train(seed=args.seed))
+    model.save(args.out)
+    print(f"Saved model to {args.out} in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,3 +15,6 @@ class SensorHealth(BaseModel):
     batteryLife: int
     accuracy: int
     lastUpdated: datetime
+
+class SensorIngest(SensorReading):
+    eventType: str = "Normal"
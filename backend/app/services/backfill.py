@@ -0,0 +1,134 @@
+"""
+Re-score historical sensor data in bulk.
+
+    python -m app.services.backfill [--from TS] [--to TS] [--out PATH]
+
+Reads a time range of stored sensor readings in chunks, scores each chunk
+with one model call and writes the predictions and risk levels to a
+history CSV.
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from app.config import DATA_DIR
+from app.models.rockfall_rf import get_model
+from app.storage import storage
+from app.storage.base import format_sensor_ts
+
+HISTORY_FILE = DATA_DIR / "prediction_history.csv"
+
+HISTORY_HEADERS = [
+    "timestamp",
+    "probability",
+    "next3Hours",
+    "next6Hours",
+    "next12Hours",
+    "next24Hours",
+]
+
+CHUNK_SIZE = 50_000
+
+
+def risk_levels(prob_percent: np.ndarray) -> np.ndarray:
+    """Vectorized prediction_generator._risk_level."""
+    return np.select(
+        [prob_percent >= 70, prob_percent >= 40],
+        ["critical", "warning"],
+        default="normal",
+    )
+
+
+def backfill(start=None, end=None, out_path=HISTORY_FILE, chunk_size=CHUNK_SIZE) -> dict:
+    """
+    Score every reading in [start, end] (naive datetimes, both optional)
+    and replace `out_path` with the results.
+    """
+    started = time.perf_counter()
+    model = get_model()
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    # a name of its own per call, so concurrent backfills don't share it
+    out = tempfile.NamedTemporaryFile(
+        "w", dir=out_path.parent, prefix=f".{out_path.name}.", suffix=".tmp",
+        delete=False, newline="", encoding="utf-8",
+    )
+
+    rows = 0
+    try:
+        with out:
+            out.write(",".join(HISTORY_HEADERS) + "\n")
+            for timestamps, features in storage.iter_reading_chunks(start, end, chunk_size):
+                if len(timestamps) == 0:
+                    continue
+                prob = model.predict_array(features)
+                # same mapping as the live loop, minus its random jitter
+                percent = np.round(np.clip(prob * 100, 0.0, 30.0), 1)
+
+                # "2025-11-11 22:41:41" -> "2025-11-11T22:41:41", in place
+                stamps = np.array(timestamps, dtype="S19")
+                stamps.view(np.uint8).reshape(-1, 19)[:, 10] = ord("T")
+
+                # few distinct percentages per chunk: format each tail once
+                values, inverse = np.unique(percent, return_inverse=True)
+                tails = [
+                    f",{p},{r3},{r6},{r12},{r24}\n"
+                    for p, r3, r6, r12, r24 in zip(
+                        values.tolist(),
+                        risk_levels(values),
+                        risk_levels(values + 5),
+                        risk_levels(values + 10),
+                        risk_levels(values + 15),
+                    )
+                ]
+                out.write("".join(map(
+                    str.__add__,
+                    stamps.astype(str).tolist(),
+                    [tails[i] for i in inverse.tolist()],
+                )))
+                rows += len(timestamps)
+        os.replace(out.name, out_path)
+    except BaseException:
+        os.unlink(out.name)
+        raise
+
+    return {
+        "rows": rows,
+        "from": format_sensor_ts(start),
+        "to": format_sensor_ts(end),
+        "output": str(out_path),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def parse_bound(value):
+    """Naive datetime for an ISO timestamp argument."""
+    if value is None:
+        return None
+    return datetime.fromisoformat(value).replace(tzinfo=None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--from", dest="start", help="ISO start timestamp (inclusive)")
+    parser.add_argument("--to", dest="end", help="ISO end timestamp (inclusive)")
+    parser.add_argument("--out", default=HISTORY_FILE, help=f"output CSV (default: {HISTORY_FILE})")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    summary = backfill(
+        parse_bound(args.start),
+        parse_bound(args.end),
+        out_path=args.out,
+        chunk_size=args.chunk_size,
+    )
+    print(f"Scored {summary['rows']} readings into {summary['output']} in {summary['seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
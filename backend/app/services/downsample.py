@@ -0,0 +1,94 @@
+import numpy as np
+
+METHODS = ("lttb", "minmax", "mean")
+
+
+def _time_buckets(t: np.ndarray, n_buckets: int):
+    """Bucket id per sample for `n_buckets` equal-width time buckets."""
+    span = int(t[-1] - t[0]) + 1
+    return (t - t[0]) * n_buckets // span
+
+
+def minmax(t: np.ndarray, y: np.ndarray, n_out: int):
+    """
+    Keep the min and the max of every time bucket (in time order), so
+    spikes survive. Returns indices into `t`/`y`, at most `n_out`.
+    """
+    n = len(t)
+    if n <= n_out:
+        return np.arange(n)
+
+    ids = _time_buckets(t, max(1, n_out // 2))
+    # within each bucket, sort by value: first = min, last = max
+    order = np.lexsort((y, ids))
+    sorted_ids = ids[order]
+    starts = np.flatnonzero(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+
+    picked = np.unique(np.concatenate([order[starts], order[ends]]))
+    return picked
+
+
+def mean(t: np.ndarray, y: np.ndarray, n_out: int):
+    """
+    Average every time bucket. Returns (timestamps, values) where the
+    timestamp is the mean time of the samples in the bucket.
+    """
+    n = len(t)
+    if n <= n_out:
+        return t, y
+
+    ids = _time_buckets(t, n_out)
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    counts = np.diff(np.r_[starts, n])
+    t_out = np.add.reduceat(t, starts) // counts
+    y_out = np.add.reduceat(y, starts) / counts
+    return t_out, y_out
+
+
+def lttb(t: np.ndarray, y: np.ndarray, n_out: int):
+    """
+    Largest-Triangle-Three-Buckets. Keeps the first and last point and,
+    from each bucket in between, the point forming the largest triangle
+    with the previously kept point and the mean of the next bucket.
+    Returns indices into `t`/`y`.
+
+    The bucket walk is inherently sequential, but the work inside each
+    bucket is vectorized, so the Python loop runs `n_out` times, not `n`.
+    """
+    n = len(t)
+    if n <= n_out:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1])[:n_out]
+
+    x = t.astype(np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+
+    picked = np.empty(n_out, dtype=np.int64)
+    picked[0] = 0
+    picked[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt_lo, nxt_hi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[nxt_lo:nxt_hi].mean()
+        avg_y = y[nxt_lo:nxt_hi].mean()
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[lo:hi] - y[a])
+            - (x[a] - x[lo:hi]) * (avg_y - y[a])
+        )
+        a = lo + int(area.argmax())
+        picked[i + 1] = a
+    return picked
+
+
+def downsample(t: np.ndarray, y: np.ndarray, n_out: int, method: str = "lttb"):
+    """Downsample one series to at most `n_out` points. Returns (t, y)."""
+    if len(t) == 0:
+        return t, y
+    if method == "mean":
+        return mean(t, y, n_out)
+    idx = minmax(t, y, n_out) if method == "minmax" else lttb(t, y, n_out)
+    return t[idx], y[idx]
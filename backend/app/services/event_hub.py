@@ -0,0 +1,89 @@
+import asyncio
+import itertools
+import json
+import threading
+
+from app.config import EVENT_QUEUE_SIZE
+
+TOPICS = ("reading", "prediction", "notification")
+
+
+class Subscriber:
+    """One connected client: a bounded queue living on the client's loop."""
+
+    def __init__(self, loop, topics, maxsize: int):
+        self.loop = loop
+        self.topics = frozenset(topics)
+        self.queue = asyncio.Queue(maxsize)
+        self.evicted = False
+
+    async def get(self):
+        """Next (id, topic, json) event, or None once evicted."""
+        return await self.queue.get()
+
+
+class EventHub:
+    """
+    In-process pub/sub for live updates.
+
+    Background threads call publish(); each event is JSON-encoded once
+    and handed to every interested subscriber's queue on its event loop,
+    so the cost per update is O(subscribers) and never touches the CSVs.
+    A subscriber whose queue is full is evicted instead of blocking the
+    publisher or growing without bound; clients simply reconnect.
+    """
+
+    def __init__(self, queue_size: int = EVENT_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.evictions = 0
+
+    def subscribe(self, topics=TOPICS) -> Subscriber:
+        """Register a subscriber; must be called from the client's event loop."""
+        sub = Subscriber(asyncio.get_running_loop(), topics, self.queue_size)
+        with self._lock:
+            self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscriber):
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, topic: str, data):
+        """Fan an event out to all subscribers. Safe to call from any thread."""
+        with self._lock:
+            targets = [s for s in self._subscribers if topic in s.topics]
+        if not targets:
+            return
+
+        event = (next(self._ids), topic, json.dumps(data, separators=(",", ":")))
+        for sub in targets:
+            try:
+                sub.loop.call_soon_threadsafe(self._deliver, sub, event)
+            except RuntimeError:
+                # the client's loop is gone
+                self.unsubscribe(sub)
+
+    def _deliver(self, sub: Subscriber, event):
+        if sub.evicted:
+            return
+        try:
+            sub.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # slow consumer: drop its backlog and tell it to go away
+            sub.evicted = True
+            self.evictions += 1
+            self.unsubscribe(sub)
+            while not sub.queue.empty():
+                sub.queue.get_nowait()
+            sub.queue.put_nowait(None)
+
+
+# process-wide hub the generators publish to
+event_hub = EventHub()
@@ -0,0 +1,52 @@
+import threading
+
+from app.services.event_hub import event_hub
+from app.services.notification_index import notification_index
+from app.services.sensor_store import sensor_store
+from app.services.snapshot import snapshot
+from app.storage import storage
+
+# numeric prediction fields (CSV rows come back as strings)
+PREDICTION_FLOATS = ("probability", "locationX", "locationY", "locationZ")
+
+
+class FollowerSync:
+    """
+    Keeps a follower worker's in-memory state current while the leader
+    does the writing: new readings go into sensor_store, new
+    notifications into notification_index, and each is re-published on
+    this worker's event_hub so its SSE/WebSocket clients see live data.
+
+    Runs as the "follower-sync" job until this worker becomes leader.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_prediction = None
+
+    def sync_once(self):
+        with self._lock:
+            self._sync()
+
+    def _sync(self):
+        for reading in sensor_store.catch_up():
+            event_hub.publish("reading", reading)
+
+        prediction = snapshot.latest_prediction()
+        if prediction is None:
+            prediction = storage.latest_prediction()
+            if prediction is not None:
+                prediction = {
+                    **prediction,
+                    **{key: float(prediction[key]) for key in PREDICTION_FLOATS},
+                }
+        if prediction is not None and prediction != self._last_prediction:
+            if self._last_prediction is not None:
+                event_hub.publish("prediction", prediction)
+            self._last_prediction = prediction
+
+        for notification in notification_index.sync():
+            event_hub.publish("notification", notification)
+
+
+follower_sync = FollowerSync()
@@ -0,0 +1,52 @@
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, so no multi-worker either
+    fcntl = None
+
+from app.config import LEADER_LOCK_FILE
+
+
+class LeaderElection:
+    """
+    Picks one process among the uvicorn workers to run the background
+    generators.
+
+    Every worker periodically tries a non-blocking exclusive flock on
+    `lock_path` (the "leader-election" job); the one that gets it is the
+    leader. The OS drops the lock when the leader exits or crashes, so a
+    follower takes over on its next attempt. The leader's pid is written
+    to the file for operators.
+    """
+
+    def __init__(self, lock_path=LEADER_LOCK_FILE):
+        self.lock_path = lock_path
+        self.is_leader = False
+        self._fd = None
+
+    def try_acquire(self) -> bool:
+        """Take the lock if it is free; True once this process leads."""
+        if self.is_leader:
+            return True
+        if fcntl is None:
+            self.is_leader = True
+            return True
+
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+
+        # keep fd open for the life of the process: closing it releases the lock
+        self._fd = fd
+        os.ftruncate(fd, 0)
+        os.write(fd, f"{os.getpid()}\n".encode())
+        self.is_leader = True
+        return True
+
+
+leader_election = LeaderElection()
@@ -0,0 +1,253 @@
+"""
+Synthetic multi-site sensor load for capacity planning.
+
+    python -m app.services.load_generator --sites 1000 --rate 1 --duration 60 --sink file --out /tmp/load/sensors.csv
+    DATA_DIR=/tmp/load python -m app.services.load_generator --sites 1000 --sink pipeline
+    python -m app.services.load_generator --sites 1000 --sink http --url http://localhost:8000 --token $ADMIN_TOKEN
+
+Every site is an independent random walk with the live generator's
+per-channel bounds and step sizes (sensor_generator.WALKS); all sites
+advance together in one NumPy step per tick. Each tick emits one reading
+per site, so the target is sites * rate readings per second.
+
+Sinks:
+    file      append sensors.csv-layout rows to --out (no server involved)
+    pipeline  the in-process live path: sensor store, storage, snapshot,
+              events. Writes into DATA_DIR, so point it somewhere else.
+    http      POST batches to /sensors/readings (admin token, and the
+              server's generator leader must be the worker that answers)
+
+Prints the achieved throughput next to the target when done.
+"""
+import argparse
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from app.services import sensor_generator
+from app.services.sensor_generator import WALKS
+from app.storage.base import CHANNELS, SENSOR_HEADERS, SENSOR_TS_FORMAT
+
+EVENT_TYPES = np.array(sensor_generator.EVENT_TYPES)
+
+HTTP_BATCH = 1000
+
+
+class SiteWalks:
+    """Random-walk state for `sites` sensor sites, one row per site."""
+
+    def __init__(self, sites: int, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.low = np.array([w[0] for w in WALKS], dtype=np.float64)
+        self.high = np.array([w[1] for w in WALKS], dtype=np.float64)
+        self.step_size = np.array([w[2] for w in WALKS], dtype=np.float64)
+        self.decimals = [w[4] for w in WALKS]
+        self.values = self.rng.uniform(
+            [w[3][0] for w in WALKS],
+            [w[3][1] for w in WALKS],
+            size=(sites, len(WALKS)),
+        )
+
+    def step(self):
+        """
+        Advance every site one reading. Returns (values, event types):
+        a rounded (sites, channels) matrix and one event type per site.
+        """
+        self.values += self.rng.uniform(-self.step_size, self.step_size, size=self.values.shape)
+        np.clip(self.values, self.low, self.high, out=self.values)
+
+        rounded = np.empty_like(self.values)
+        for i, decimals in enumerate(self.decimals):
+            np.round(self.values[:, i], decimals, out=rounded[:, i])
+        events = EVENT_TYPES[self.rng.integers(0, len(EVENT_TYPES), len(rounded))]
+        return rounded, events
+
+
+# ===============================
+# SINKS
+# ===============================
+
+class FileSink:
+    """Append rows to a sensors.csv-layout file."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        is_new = not self.path.exists() or self.path.stat().st_size == 0
+        self._f = open(self.path, "a", newline="", encoding="utf-8")
+        if is_new:
+            self._f.write(",".join(SENSOR_HEADERS) + "\n")
+
+    def send(self, timestamp: str, values, events):
+        prefix = timestamp + ","
+        self._f.write("".join(
+            f"{prefix}{ax},{ay},{az},{inc},{ext},{piez},{event}\n"
+            for (ax, ay, az, inc, ext, piez), event in zip(values.tolist(), events.tolist())
+        ))
+
+    def close(self):
+        self._f.close()
+
+
+class PipelineSink:
+    """Feed rows through sensor_generator.ingest_rows in this process."""
+
+    def __init__(self):
+        self._ingest = sensor_generator.ingest_rows
+        self._storage = sensor_generator.storage
+
+    def send(self, timestamp: str, values, events):
+        self._ingest([
+            [timestamp, *row, event]
+            for row, event in zip(values.tolist(), events.tolist())
+        ])
+
+    def close(self):
+        # count the time it takes to get everything on disk
+        self._storage.flush()
+
+
+class HttpSink:
+    """POST rows as JSON batches to {url}/sensors/readings."""
+
+    def __init__(self, url: str, token: str | None, batch: int = HTTP_BATCH, concurrency: int = 4):
+        self.url = url.rstrip("/") + "/sensors/readings"
+        self.headers = {"Content-Type": "application/json"}
+        if token:
+            self.headers["X-Admin-Token"] = token
+        self.batch = batch
+        self.errors = 0
+        self._pool = ThreadPoolExecutor(max_workers=concurrency)
+
+    def _post(self, payload: bytes):
+        request = urllib.request.Request(self.url, data=payload, headers=self.headers, method="POST")
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                response.read()
+        except (urllib.error.URLError, OSError) as e:
+            self.errors += 1
+            if self.errors <= 5:
+                print(f"⚠️ POST failed: {e}")
+
+    def send(self, timestamp: str, values, events):
+        stamp = timestamp.replace(" ", "T")
+        names = list(CHANNELS)
+        readings = [
+            {"timestamp": stamp, **dict(zip(names, row)), "eventType": event}
+            for row, event in zip(values.tolist(), events.tolist())
+        ]
+        # batches of one tick are in flight together; wait before the next
+        # tick so a later batch never lands before an earlier one
+        futures = [
+            self._pool.submit(self._post, json.dumps(readings[i:i + self.batch]).encode())
+            for i in range(0, len(readings), self.batch)
+        ]
+        for future in futures:
+            future.result()
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+
+
+# ===============================
+# DRIVER
+# ===============================
+
+def run(sink, sites: int, rate: float, duration: float, start: datetime | None = None, seed=None) -> dict:
+    """
+    Emit `sites` readings per tick, `rate` ticks per second (0 means as
+    fast as possible), for `duration` seconds of wall time.
+
+    Timestamps follow a simulated clock that starts at `start` (default:
+    now) and advances 1 / rate seconds per tick, or 1 s when unthrottled.
+    """
+    walks = SiteWalks(sites, seed)
+    interval = 1.0 / rate if rate > 0 else 0.0
+    clock = start or datetime.now()
+    clock_step = timedelta(seconds=interval or 1.0)
+
+    ticks = late = 0
+    max_lag = 0.0
+    began = time.perf_counter()
+    deadline = began + duration
+    next_tick = began
+    try:
+        while time.perf_counter() < deadline:
+            values, events = walks.step()
+            sink.send(clock.strftime(SENSOR_TS_FORMAT), values, events)
+            ticks += 1
+            clock += clock_step
+
+            if interval:
+                # fixed rate: sleep to the next slot, or note that we fell behind
+                next_tick += interval
+                lag = time.perf_counter() - next_tick
+                if lag > 0:
+                    late += 1
+                    max_lag = max(max_lag, lag)
+                else:
+                    time.sleep(-lag)
+    finally:
+        sink.close()
+    elapsed = time.perf_counter() - began
+
+    rows = ticks * sites
+    return {
+        "sites": sites,
+        "ticks": ticks,
+        "rows": rows,
+        "seconds": round(elapsed, 3),
+        "rowsPerSecond": round(rows / elapsed, 1) if elapsed else 0.0,
+        "targetRowsPerSecond": round(sites * rate, 1) if rate > 0 else None,
+        "lateTicks": late,
+        "maxLagSeconds": round(max_lag, 3),
+        "errors": getattr(sink, "errors", 0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sites", type=int, default=1000, help="simulated sensor sites")
+    parser.add_argument("--rate", type=float, default=1.0, help="readings per site per second (0: unthrottled)")
+    parser.add_argument("--duration", type=float, default=10.0, help="wall-clock seconds to run")
+    parser.add_argument("--sink", choices=["file", "pipeline", "http"], default="file")
+    parser.add_argument("--out", default="load/sensors.csv", help="file sink: output CSV")
+    parser.add_argument("--url", default="http://localhost:8000", help="http sink: server base URL")
+    parser.add_argument("--token", default=os.getenv("ADMIN_TOKEN"), help="http sink: admin token")
+    parser.add_argument("--batch", type=int, default=HTTP_BATCH, help="http sink: readings per request")
+    parser.add_argument("--concurrency", type=int, default=4, help="http sink: parallel requests")
+    parser.add_argument("--start", help="ISO timestamp of the first tick (default: now)")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    if args.sink == "file":
+        sink = FileSink(args.out)
+    elif args.sink == "pipeline":
+        sink = PipelineSink()
+    else:
+        sink = HttpSink(args.url, args.token, args.batch, args.concurrency)
+
+    start = datetime.fromisoformat(args.start).replace(tzinfo=None) if args.start else None
+    summary = run(sink, args.sites, args.rate, args.duration, start=start, seed=args.seed)
+
+    target = summary["targetRowsPerSecond"]
+    print(
+        f"{summary['rows']} readings from {summary['sites']} sites in {summary['seconds']}s: "
+        f"{summary['rowsPerSecond']} rows/s"
+        + (f" (target {target})" if target else " (unthrottled)")
+    )
+    if summary["lateTicks"]:
+        print(f"⚠️ {summary['lateTicks']} ticks late, max lag {summary['maxLagSeconds']}s")
+    if summary["errors"]:
+        print(f"❌ {summary['errors']} failed requests")
+
+
+if __name__ == "__main__":
+    main()
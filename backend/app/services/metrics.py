@@ -0,0 +1,286 @@
+import math
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+
+# latency buckets in seconds (Prometheus client defaults plus a few fast ones)
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    return repr(float(value))
+
+
+class _Metric(ABC):
+    kind = None
+
+    def __init__(self, name: str, help: str, labels=()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._children = {}
+        self._lock = threading.Lock()
+        if not self.label_names:
+            self._default = self.labels()
+
+    def labels(self, *values):
+        """The child for one combination of label values."""
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    @abstractmethod
+    def _new_child(self):
+        """A fresh child holding one label combination's value."""
+
+    @abstractmethod
+    def samples(self):
+        """(suffix, label names, label values, extra label, value) tuples."""
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, names, values, extra, value in self.samples():
+            lines.append(f"{self.name}{suffix}{_labels(names, values, extra)} {_number(value)}")
+        return lines
+
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1):
+        self.inc(-amount)
+
+    def set(self, value: float):
+        self.value = value
+
+
+class Counter(_Metric):
+    """A monotonically increasing count; by convention named *_total."""
+
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1):
+        self._default.inc(amount)
+
+    def samples(self):
+        for key, child in list(self._children.items()):
+            yield "", self.label_names, key, "", child.value
+
+
+class Gauge(_Metric):
+    """A value that goes up and down."""
+
+    kind = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1):
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1):
+        self._default.dec(amount)
+
+    def set(self, value: float):
+        self._default.set(value)
+
+    def samples(self):
+        for key, child in list(self._children.items()):
+            yield "", self.label_names, key, "", child.value
+
+
+class _HistogramValue:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # the last one is +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        i = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative `le` buckets, plus their sum."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels=(), buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help, labels)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        self._default.observe(value)
+
+    def samples(self):
+        for key, child in list(self._children.items()):
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            running = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                running += count
+                yield "_bucket", self.label_names, key, f'le="{_number(bound)}"', running
+            yield "_sum", self.label_names, key, "", total
+            yield "_count", self.label_names, key, "", running
+
+
+class Collected(_Metric):
+    """
+    A counter or gauge whose values are read at scrape time from `collect`,
+    which returns a number or a {label values tuple: number} dict. For
+    state the app already keeps (file sizes, queue depths, job stats).
+    """
+
+    def __init__(self, name: str, help: str, collect, labels=(), kind: str = "gauge"):
+        self.kind = kind
+        self.collect = collect
+        super().__init__(name, help, labels)
+
+    def _new_child(self):
+        return None
+
+    def samples(self):
+        values = self.collect()
+        if values is None:
+            return
+        if not isinstance(values, dict):
+            values = {(): values}
+        for key, value in values.items():
+            if value is not None:
+                yield "", self.label_names, key, "", value
+
+
+class Registry:
+    """Every metric of this process, rendered in Prometheus text format."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help, labels=()) -> Counter:
+        return self.register(Counter(name, help, labels))
+
+    def gauge(self, name, help, labels=()) -> Gauge:
+        return self.register(Gauge(name, help, labels))
+
+    def histogram(self, name, help, labels=(), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labels, buckets))
+
+    def collected(self, name, help, collect, labels=(), kind="gauge") -> Collected:
+        return self.register(Collected(name, help, collect, labels, kind))
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            try:
+                lines.extend(metric.render())
+            except Exception as e:
+                # one broken collector must not take the whole scrape down
+                lines.append(f"# {metric.name} unavailable: {_escape(e)}")
+        return "\n".join(lines) + "\n"
+
+
+# process-wide registry; every uvicorn worker reports its own numbers
+registry = Registry()
+
+# ===============================
+# INSTRUMENTS
+# ===============================
+
+http_requests = registry.histogram(
+    "http_request_duration_seconds",
+    "Time from request start to the last response byte.",
+    ["method", "route", "status"],
+)
+http_response_size = registry.histogram(
+    "http_response_size_bytes",
+    "Response body size.",
+    ["method", "route"],
+    buckets=SIZE_BUCKETS,
+)
+http_in_flight = registry.gauge(
+    "http_requests_in_flight",
+    "Requests currently being served.",
+)
+
+job_duration = registry.histogram(
+    "job_duration_seconds",
+    "Background job run time per tick.",
+    ["job"],
+)
+job_lag = registry.gauge(
+    "job_start_lag_seconds",
+    "How late the last run of a job started, relative to its slot.",
+    ["job"],
+)
+
+rows_appended = registry.counter(
+    "rows_appended_total",
+    "Rows handed to storage.",
+    ["kind"],
+)
+model_inference = registry.histogram(
+    "model_inference_seconds",
+    "Time per model scoring call.",
+)
+model_rows_scored = registry.counter(
+    "model_rows_scored_total",
+    "Feature rows scored by the model.",
+)
+notifications_sent = registry.counter(
+    "notifications_total",
+    "Notifications pushed, by level.",
+    ["level"],
+)
+response_cache_requests = registry.counter(
+    "response_cache_requests_total",
+    "Cacheable GET requests, by route and result (hit, miss, not_modified).",
+    ["route", "result"],
+)
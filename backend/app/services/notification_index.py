@@ -0,0 +1,212 @@
+import json
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+
+from app.config import NOTIFICATIONS_READ_FILE
+from app.storage import storage as default_storage
+
+
+class NotificationIndex:
+    """
+    All notifications held in memory, with a position list per level.
+
+    A notification's id is its 1-based position in the log, which never
+    changes because the log is append-only. Timestamps only grow, so
+    time bounds and `before` cursors are binary searches, and pages cost
+    O(log n + limit) whatever the filters. Counts per level come from
+    list lengths, so badge and summary polls never touch storage.
+
+    Loaded from storage on first use; push_notification keeps it current.
+    A single "read up to id" watermark drives the `read` flags and
+    unread counts, and is saved to `read_file`. Every read stats that
+    file, so marks made on another worker show up on this one at once.
+    """
+
+    def __init__(self, storage=default_storage, read_file=NOTIFICATIONS_READ_FILE):
+        self._storage = storage
+        self.read_file = Path(read_file)
+        self._lock = threading.Lock()
+        self._entries = []
+        self._timestamps = []
+        self._by_level = {}
+        self._read_upto = 0
+        self._read_stamp = None  # stat of read_file when last loaded
+        self._loaded = False
+
+    # ---------- writing ----------
+
+    def _add(self, timestamp: str, level: str, message: str) -> dict:
+        entry = {
+            "id": len(self._entries) + 1,
+            "timestamp": timestamp,
+            "level": level,
+            "message": message,
+        }
+        self._by_level.setdefault(level, []).append(len(self._entries))
+        self._entries.append(entry)
+        self._timestamps.append(timestamp)
+        return entry
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._storage.flush()
+            for row in self._storage.iter_notifications():
+                self._add(row["timestamp"], row["level"], row["message"])
+            self._sync_read_upto()
+            self._loaded = True
+
+    def _sync_read_upto(self):
+        # caller holds the lock; picks up marks saved by other workers,
+        # re-reading the file only when its stat changed
+        try:
+            st = self.read_file.stat()
+        except FileNotFoundError:
+            return
+        stamp = st.st_ino, st.st_mtime_ns, st.st_size
+        if stamp != self._read_stamp:
+            self._read_stamp = stamp
+            self._read_upto = max(self._read_upto, self._saved_read_upto())
+
+    def _saved_read_upto(self) -> int:
+        try:
+            return int(json.loads(self.read_file.read_text())["readUpTo"])
+        except Exception:
+            return 0
+
+    def add(self, timestamp: str, level: str, message: str) -> dict:
+        """
+        Index a new notification and return it with its id. Call before
+        storing it, so a first-time load cannot pick it up twice.
+        """
+        self._ensure_loaded()
+        with self._lock:
+            return dict(self._add(timestamp, level, message))
+
+    def sync(self) -> list[dict]:
+        """
+        Pick up notifications and read marks stored by another process
+        (see follower_sync); returns the new notifications.
+        """
+        self._ensure_loaded()
+        with self._lock:
+            start = len(self._entries)
+            new = [
+                dict(self._add(row["timestamp"], row["level"], row["message"]))
+                for row in self._storage.iter_notifications(start)
+            ]
+            self._sync_read_upto()
+            return new
+
+    def mark_read(self, upto: int | None = None) -> int:
+        """Mark notifications up to id `upto` (default: all) as read."""
+        self._ensure_loaded()
+        with self._lock:
+            total = len(self._entries)
+            upto = total if upto is None else max(0, min(upto, total))
+            self._read_upto = max(self._read_upto, upto)
+            tmp = self.read_file.with_name(f".{self.read_file.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({"readUpTo": self._read_upto}))
+            os.replace(tmp, self.read_file)
+            return self._read_upto
+
+    # ---------- reading ----------
+
+    def version(self):
+        """A token that changes whenever a notification or read mark is added."""
+        self._ensure_loaded()
+        with self._lock:
+            self._sync_read_upto()
+            return len(self._entries), self._read_upto
+
+    def query(self, level=None, start=None, end=None, before=None, limit=None):
+        """
+        Notifications matching `level` with start <= timestamp <= end and
+        id < before (all optional), oldest first. With `limit`, only the
+        newest `limit` matches. Bounds are ISO timestamp strings.
+        """
+        self._ensure_loaded()
+        with self._lock:
+            self._sync_read_upto()
+            positions, lo, hi = self._bounds(level, start, end, before, limit)
+            read_upto = self._read_upto
+            return [
+                {**self._entries[p], "read": p < read_upto}
+                for p in positions[lo:hi]
+            ]
+
+    def iter_query(self, level=None, start=None, end=None, before=None, limit=None, chunk=1000):
+        """
+        query(), produced lazily `chunk` notifications at a time, so a
+        stream of the whole log never holds more than one chunk.
+        """
+        self._ensure_loaded()
+        with self._lock:
+            self._sync_read_upto()
+            positions, lo, hi = self._bounds(level, start, end, before, limit)
+        for i in range(lo, hi, chunk):
+            # positions only ever grow at the end, so [lo, hi) stays valid
+            with self._lock:
+                read_upto = self._read_upto
+                batch = [
+                    {**self._entries[p], "read": p < read_upto}
+                    for p in positions[i:min(i + chunk, hi)]
+                ]
+            yield from batch
+
+    def _bounds(self, level, start, end, before, limit):
+        # caller holds the lock; (positions, lo, hi) of the matches
+        if level is None:
+            positions = range(len(self._entries))
+        else:
+            positions = self._by_level.get(level, [])
+
+        def ts(p):
+            return self._timestamps[p]
+
+        lo, hi = 0, len(positions)
+        if start is not None:
+            lo = bisect_left(positions, start, key=ts)
+        if end is not None:
+            hi = bisect_right(positions, end, key=ts)
+        if before is not None:
+            hi = min(hi, bisect_left(positions, before - 1))
+        if limit is not None:
+            lo = max(lo, hi - limit)
+        return positions, lo, hi
+
+    def summary(self, since=None) -> dict:
+        """
+        Totals, unread counts and counts since `since` (ISO timestamp)
+        per level, from list lengths and binary searches only.
+        """
+        self._ensure_loaded()
+        with self._lock:
+            self._sync_read_upto()
+            n = len(self._entries)
+            read_upto = self._read_upto
+            first = 0 if since is None else bisect_left(self._timestamps, since)
+
+            levels = {}
+            for level, positions in self._by_level.items():
+                levels[level] = {
+                    "total": len(positions) - bisect_left(positions, first),
+                    "unread": len(positions) - bisect_left(positions, read_upto),
+                }
+            return {
+                "since": since,
+                "total": n - first,
+                "unread": n - read_upto,
+                "latestId": n,
+                "readUpTo": read_upto,
+                "levels": levels,
+            }
+
+
+# process-wide index shared by the API and push_notification
+notification_index = NotificationIndex()
@@ -0,0 +1,99 @@
+import threading
+import time
+
+from app.api.notifications import push_notification
+from app.config import NOTIFY_COOLDOWN_SECONDS, NOTIFY_HYSTERESIS, NOTIFY_REMIND_SECONDS
+
+# least to most severe, with the probability (%) where each level starts
+LEVELS = ("normal", "warning", "critical")
+THRESHOLDS = {"normal": 0.0, "warning": 40.0, "critical": 70.0}
+
+
+class RiskNotifier:
+    """
+    Turns the stream of risk probabilities into a few notifications.
+
+    Only level changes are announced. Leaving a level needs the
+    probability to drop `hysteresis` points below its threshold, so a
+    value hovering at the boundary does not flap. Alerts are at least
+    `cooldown` seconds apart, except escalations, which always go out
+    at once; a de-escalation inside the cooldown is announced when the
+    cooldown ends, if it still holds.
+
+    Repeats are not written: they are counted, and a persisting
+    warning/critical level produces one "still ..." reminder carrying
+    that count every `remind` seconds.
+    """
+
+    def __init__(
+        self,
+        push,
+        hysteresis: float = NOTIFY_HYSTERESIS,
+        cooldown: float = NOTIFY_COOLDOWN_SECONDS,
+        remind: float = NOTIFY_REMIND_SECONDS,
+        clock=time.monotonic,
+    ):
+        self.push = push  # push(level, message)
+        self.hysteresis = hysteresis
+        self.cooldown = cooldown
+        self.remind = remind
+        self.clock = clock
+        self.level = None  # current level, with hysteresis applied
+        self.announced = None  # level of the last notification
+        self.repeats = 0  # observations since the last notification
+        self._last_push = None
+        self._lock = threading.Lock()
+
+    def classify(self, prob_percent: float) -> str:
+        """Level for `prob_percent`, sticky around the current level."""
+        raw = LEVELS[0]
+        for name in LEVELS:
+            if prob_percent >= THRESHOLDS[name]:
+                raw = name
+        current = self.level
+        if current is None or LEVELS.index(raw) >= LEVELS.index(current):
+            return raw
+        # dropping: stay until clearly below the current level's threshold
+        if prob_percent >= THRESHOLDS[current] - self.hysteresis:
+            return current
+        return raw
+
+    def observe(self, prob_percent: float):
+        """Feed one prediction; pushes a notification when one is due."""
+        with self._lock:
+            self.level = level = self.classify(prob_percent)
+            now = self.clock()
+            since_push = None if self._last_push is None else now - self._last_push
+
+            if level != self.announced:
+                if self.announced is None:
+                    # fresh start: a normal reading is nothing to report
+                    due = level != "normal"
+                    if not due:
+                        self.announced = level
+                elif LEVELS.index(level) > LEVELS.index(self.announced):
+                    due = True
+                else:
+                    due = since_push is None or since_push >= self.cooldown
+                if due:
+                    self._emit(level, f"Rockfall risk is {level.upper()} ({prob_percent:.1f}%)", now)
+                    return
+            elif level != "normal" and since_push is not None and since_push >= self.remind:
+                self._emit(
+                    level,
+                    f"Rockfall risk still {level.upper()} ({prob_percent:.1f}%), "
+                    f"{self.repeats + 1} predictions since last alert",
+                    now,
+                )
+                return
+            self.repeats += 1
+
+    def _emit(self, level: str, message: str, now: float):
+        self.push(level, message)
+        self.announced = level
+        self.repeats = 0
+        self._last_push = now
+
+
+# fed by the prediction loop; the only source of risk notifications
+risk_notifier = RiskNotifier(push_notification)
@@ -1,23 +1,16 @@
+import logging
 import time
-import csv
 import random
-from pathlib import Path
 from datetime import datetime
-from threading import Thread
 
-from app.models.rockfall_rf import rf_model
-from app.api.notifications import push_notification  # 🔔 use your real path
-
-BASE_DIR = Path(__file__).resolve().parent.parent.parent
-DATA_DIR = BASE_DIR / "data"
-
-SENSOR_FILE = DATA_DIR / "sensors.csv"
-PRED_FILE = DATA_DIR / "prediction.csv"
-
-print("SENSOR_FILE =", SENSOR_FILE.resolve())
-print("PRED_FILE   =", PRED_FILE.resolve())
-
-model = rf_model
+from app.models.rockfall_rf import get_model
+from app.services.event_hub import event_hub
+from app.services.metrics import rows_appended
+from app.services.notifier import risk_notifier
+from app.services.sensor_store import sensor_store
+from app.services.snapshot import snapshot
+from app.storage import storage
+from app.storage.base import PREDICTION_HEADERS
 
 # ---- state for moving coordinates ----
 current_x = 12.5
@@ -27,6 +20,8 @@ current_z = -45.0
 LAST_COORD_UPDATE = 0
 COORD_UPDATE_INTERVAL = 60  # seconds
 
+logger = logging.getLogger(__name__)
+
 
 def _risk_level(prob_percent: float) -> str:
     if prob_percent >= 70:
@@ -36,101 +31,66 @@ def _risk_level(prob_percent: float) -> str:
     return "normal"
 
 
-def run_prediction_loop():
-    global current_x, current_y, current_z, LAST_COORD_UPDATE
-
-    print("Prediction loop started")
-    while True:
-        try:
-            if not SENSOR_FILE.exists():
-                print("No sensors.csv yet")
-                time.sleep(5)
-                continue
-
-            with open(SENSOR_FILE, newline="", encoding="utf-8") as f:
-                rows = list(csv.DictReader(f))
-                print("Rows read:", len(rows))
-                if not rows:
-                    time.sleep(5)
-                    continue
-
-                last = rows[-1]
-                print("Last row:", last)
-
-                features = [
-                    float(last["Accelerometer X (g)"]),
-                    float(last["Accelerometer Y (g)"]),
-                    float(last["Accelerometer Z (g)"]),
-                    float(last["Inclinometer (deg)"]),
-                    float(last["Extensometer (mm)"]),
-                    float(last["Piezometer (kPa)"]),
-                ]
-
-                # base probability from model (0–100)
-                prob_0_1 = model.predict_probability(features)
-                base = max(0.0, min(prob_0_1 * 100, 30.0))
-                prob_percent = round(base + random.uniform(-5, 5), 1)
-                prob_percent = max(0.0, min(prob_percent, 35.0))
-                print("Prob %:", prob_percent)
-
-                risk = _risk_level(prob_percent)
-
-                # 🔔 push notification when a new prediction is generated
-                push_notification(
-                    risk,
-                    f"Rockfall risk is {risk.upper()} ({prob_percent:.1f}%)"
-                )
-
-                DATA_DIR.mkdir(exist_ok=True)
-                write_header = not PRED_FILE.exists()
-
-                with open(PRED_FILE, "a", newline="", encoding="utf-8") as pf:
-                    writer = csv.writer(pf)
-                    if write_header:
-                        print("Writing header to", PRED_FILE)
-                        writer.writerow(
-                            [
-                                "timestamp",
-                                "probability",
-                                "next3Hours",
-                                "next6Hours",
-                                "next12Hours",
-                                "next24Hours",
-                                "locationX",
-                                "locationY",
-                                "locationZ",
-                            ]
-                        )
-
-                    print("Appending row to", PRED_FILE)
-                    writer.writerow(
-                        [
-                            datetime.now().isoformat(),
-                            prob_percent,
-                            risk,
-                            _risk_level(prob_percent + 5),
-                            _risk_level(prob_percent + 10),
-                            _risk_level(prob_percent + 15),
-                            current_x,
-                            current_y,
-                            current_z,
-                        ]
-                    )
-
-                # occasionally move the predicted location a bit
-                now_ts = time.time()
-                if now_ts - LAST_COORD_UPDATE > COORD_UPDATE_INTERVAL:
-                    LAST_COORD_UPDATE = now_ts
-                    current_x += random.uniform(-1.0, 1.0)
-                    current_y += random.uniform(-1.0, 1.0)
-                    current_z += random.uniform(-0.5, 0.5)
-                    print("Updated coords:", current_x, current_y, current_z)
-
-        except Exception as e:
-            print("Prediction error:", e)
-
-        time.sleep(5)
-
-
-def start_prediction_generator():
-    Thread(target=run_prediction_loop, daemon=True).start()
+# sensor_store cursor: rows up to this sequence number are scored
+_scored_seq = None
+
+
+def run_prediction_tick():
+    """Score every sensor row appended since the previous tick."""
+    global current_x, current_y, current_z, LAST_COORD_UPDATE, _scored_seq
+
+    if _scored_seq is None:
+        # on startup, score the newest existing reading only
+        _scored_seq = max(sensor_store.seq - 1, 0)
+
+    _scored_seq, _, cols = sensor_store.since(_scored_seq)
+    features = cols.T
+    if len(features) == 0:
+        return
+
+    out_rows = []
+    prob_percent = risk = None
+    for prob_0_1 in get_model().predict_probabilities(features):
+        # base probability from model (0–100)
+        base = max(0.0, min(prob_0_1 * 100, 30.0))
+        prob_percent = round(base + random.uniform(-5, 5), 1)
+        prob_percent = max(0.0, min(prob_percent, 35.0))
+
+        risk = _risk_level(prob_percent)
+        risk_notifier.observe(prob_percent)
+        out_rows.append(
+            [
+                datetime.now().isoformat(),
+                prob_percent,
+                risk,
+                _risk_level(prob_percent + 5),
+                _risk_level(prob_percent + 10),
+                _risk_level(prob_percent + 15),
+                current_x,
+                current_y,
+                current_z,
+            ]
+        )
+    logger.debug("scored readings", extra={"rows": len(out_rows), "probability": prob_percent, "risk": risk})
+
+    storage.append_predictions(out_rows)
+    rows_appended.labels("predictions").inc(len(out_rows))
+    latest = dict(zip(PREDICTION_HEADERS, out_rows[-1]))
+    snapshot.write_prediction(latest)
+    event_hub.publish("prediction", latest)
+
+    # occasionally move the predicted location a bit
+    now_ts = time.time()
+    if now_ts - LAST_COORD_UPDATE > COORD_UPDATE_INTERVAL:
+        LAST_COORD_UPDATE = now_ts
+        current_x += random.uniform(-1.0, 1.0)
+        current_y += random.uniform(-1.0, 1.0)
+        current_z += random.uniform(-0.5, 0.5)
+        logger.debug("moved predicted location", extra={"x": current_x, "y": current_y, "z": current_z})
+
+
+def backlog():
+    """Readings appended but not scored yet; None before the first tick."""
+    if _scored_seq is None:
+        return None
+    return sensor_store.seq - _scored_seq
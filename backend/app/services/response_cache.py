@@ -0,0 +1,180 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.config import COALESCE_TTL_SECONDS, RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_MAX_ENTRIES
+from app.services.metrics import response_cache_requests
+from app.utils.profiling import phase, profiled
+from app.utils.single_flight import SingleFlight
+
+
+class _Entry:
+    __slots__ = ("version", "body", "media_type", "etag", "last_modified")
+
+    def __init__(self, version, body: bytes, media_type: str):
+        self.version = version
+        self.body = body
+        self.media_type = media_type
+        # a hash of the body, so every worker hands out the same tag
+        self.etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        self.last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+
+
+class ResponseCache:
+    """
+    Serialized JSON bodies of polled GET endpoints, reused while the data
+    behind them is unchanged.
+
+    Each endpoint passes a `version`: any cheap value that changes when
+    its data does (an append counter, a file's size and mtime). Entries
+    are keyed on path and query and replaced when the version moves on,
+    so a poll between two generator ticks costs a dict lookup. Responses
+    carry ETag and Last-Modified, and conditional requests that still
+    match get an empty 304.
+
+    Bodies are bounded LRU-style by count and total bytes; a body over a
+    quarter of the byte budget is served but never kept. respond_shared()
+    also coalesces identical concurrent requests.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        coalesce_ttl: float = COALESCE_TTL_SECONDS,
+    ):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._flights = SingleFlight(ttl=coalesce_ttl)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.version != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _put(self, key, entry: _Entry):
+        with self._lock:
+            old = self._entries.get(key)
+            if old is not None:
+                if old.etag == entry.etag:
+                    entry.last_modified = old.last_modified
+                elif entry.last_modified <= old.last_modified:
+                    # Last-Modified has whole seconds; never repeat one for new content
+                    entry.last_modified = old.last_modified + timedelta(seconds=1)
+            if len(entry.body) > self.max_bytes // 4:
+                return
+            if old is not None:
+                del self._entries[key]
+                self._bytes -= len(old.body)
+            self._entries[key] = entry
+            self._bytes += len(entry.body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.body)
+
+    def clear(self):
+        """Drop every cached body and shared result (benchmarks, tests)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        self._flights.clear()
+
+    def _lookup(self, key, version, build, media_type):
+        entry = self._get(key, version)
+        if entry is not None:
+            return entry, "hit"
+        content = build()
+        if not isinstance(content, bytes):
+            with phase("encode"):
+                content = JSONResponse(jsonable_encoder(content)).body
+        entry = _Entry(version, content, media_type)
+        self._put(key, entry)
+        return entry, "miss"
+
+    def respond(self, request: Request, version, build, media_type: str = "application/json") -> Response:
+        """
+        The JSON response for `request`: the cached body if it was built
+        at `version`, otherwise `build()` serialized and cached. A 304
+        if the client already has it. `build` may also return the body
+        already encoded, as bytes of `media_type`.
+        """
+        key = _key(request)
+        entry, result = self._lookup(key, version, build, media_type)
+        return _response(request, entry, result)
+
+    async def respond_shared(
+        self, request: Request, version, build, media_type: str = "application/json",
+    ) -> Response:
+        """
+        respond() for expensive endpoints, from async handlers: `version`
+        is a callable too, and both run in the threadpool. Identical
+        requests arriving together (or within COALESCE_TTL_SECONDS of the
+        last one finishing) share that one lookup or build, so a burst of
+        polls costs one scan and holds one thread.
+        """
+        key = _key(request)
+        (entry, result), shared = await self._flights.run(
+            key, profiled(lambda: self._lookup(key, version(), build, media_type)),
+        )
+        return _response(request, entry, "coalesced" if shared else result)
+
+
+def _key(request: Request):
+    return request.url.path, tuple(sorted(request.query_params.multi_items()))
+
+
+def _response(request: Request, entry: _Entry, result: str) -> Response:
+    headers = {
+        "ETag": entry.etag,
+        "Last-Modified": format_datetime(entry.last_modified, usegmt=True),
+        # cache, but ask again every time; a 304 is cheap
+        "Cache-Control": "no-cache",
+    }
+    route = getattr(request.scope.get("route"), "path", "unmatched")
+    if _not_modified(request, entry):
+        response_cache_requests.labels(route, "not_modified").inc()
+        return Response(status_code=304, headers=headers)
+    response_cache_requests.labels(route, result).inc()
+    return Response(entry.body, media_type=entry.media_type, headers=headers)
+
+
+def _not_modified(request: Request, entry: _Entry) -> bool:
+    # If-None-Match wins over If-Modified-Since when both are sent (RFC 9110)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or entry.etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return entry.last_modified <= since
+
+
+# per worker; entries never outlive the data state they were built from
+response_cache = ResponseCache()
@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import SCHEDULER_SHUTDOWN_SECONDS, SCHEDULER_WORKERS
+from app.services.metrics import job_duration, job_lag
+
+logger = logging.getLogger(__name__)
+
+
+class Job:
+    """A blocking function run every `interval` seconds, plus its stats."""
+
+    def __init__(self, name: str, func, interval: float, enabled: bool = True):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.enabled = enabled
+        self.runs = 0
+        self.failures = 0
+        self.overruns = 0  # runs that took longer than the interval
+        self.skipped = 0  # ticks dropped because of an overrun
+        self.last_started = None
+        self.last_lag = None  # how late the last run started vs its slot
+        self.last_duration = None
+        self.max_duration = 0.0
+        self.total_duration = 0.0
+
+    def stats(self) -> dict:
+        return {
+            "interval": self.interval,
+            "enabled": self.enabled,
+            "runs": self.runs,
+            "failures": self.failures,
+            "overruns": self.overruns,
+            "skippedTicks": self.skipped,
+            "lastStarted": self.last_started,
+            "lastLag": self.last_lag,
+            "lastDuration": self.last_duration,
+            "maxDuration": self.max_duration,
+            "meanDuration": self.total_duration / self.runs if self.runs else None,
+        }
+
+
+class Scheduler:
+    """
+    Runs the background jobs on the app's event loop, started and stopped
+    by the FastAPI lifespan.
+
+    Ticks are fixed-rate: a job due every 5 s runs at t0, t0+5, t0+10...
+    however long each run takes, so the period does not drift. A run that
+    overshoots its slot is counted as an overrun and the missed ticks are
+    skipped rather than fired in a burst. The work itself goes to a
+    bounded thread pool so the event loop never blocks, and each job has
+    at most one run in flight.
+
+    Disabled jobs keep their schedule but skip their runs, so they can be
+    paused and resumed (e.g. on leader election) from any thread.
+    """
+
+    def __init__(self, workers: int = SCHEDULER_WORKERS):
+        self.workers = workers
+        self.jobs = {}
+        self._executor = None
+        self._tasks = []
+        self._stopping = None
+
+    def add_job(self, name: str, func, interval: float, enabled: bool = True) -> Job:
+        job = Job(name, func, interval, enabled)
+        self.jobs[name] = job
+        return job
+
+    def pause(self, name: str):
+        self.jobs[name].enabled = False
+
+    def resume(self, name: str):
+        self.jobs[name].enabled = True
+
+    def set_interval(self, name: str, interval: float):
+        """Change a job's period; applies from its next tick."""
+        self.jobs[name].interval = interval
+
+    def stats(self) -> dict:
+        return {name: job.stats() for name, job in self.jobs.items()}
+
+    # ---------- lifecycle ----------
+
+    async def start(self):
+        self._stopping = asyncio.Event()
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="job")
+        self._tasks = [
+            asyncio.create_task(self._run(job), name=f"job:{job.name}")
+            for job in self.jobs.values()
+        ]
+
+    async def stop(self, timeout: float = SCHEDULER_SHUTDOWN_SECONDS):
+        """Stop ticking and wait (up to `timeout`) for running jobs to finish."""
+        if self._stopping is None:
+            return
+        self._stopping.set()
+        done, pending = await asyncio.wait(self._tasks, timeout=timeout) if self._tasks else ((), ())
+        for task in pending:
+            logger.warning("job did not stop in time", extra={"job": task.get_name(), "timeout": timeout})
+            task.cancel()
+        self._executor.shutdown(wait=False)
+        self._tasks = []
+        self._stopping = None
+
+    async def _sleep_until(self, deadline: float) -> bool:
+        """Wait for `deadline` (monotonic); False if stopping meanwhile."""
+        try:
+            await asyncio.wait_for(self._stopping.wait(), max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            return True
+        return False
+
+    async def _run(self, job: Job):
+        loop = asyncio.get_running_loop()
+        anchor = time.monotonic()
+        interval = job.interval
+        tick = 0
+        while not self._stopping.is_set():
+            if job.interval != interval:
+                # re-anchor so the new period starts from this tick
+                anchor, interval, tick = anchor + tick * interval, job.interval, 0
+
+            if job.enabled:
+                started = time.monotonic()
+                job.last_started = time.time()
+                job.last_lag = max(0.0, started - (anchor + tick * interval))
+                job_lag.labels(job.name).set(job.last_lag)
+                try:
+                    await loop.run_in_executor(self._executor, job.func)
+                except Exception:
+                    job.failures += 1
+                    logger.exception("job failed", extra={"job": job.name})
+                duration = time.monotonic() - started
+                job_duration.labels(job.name).observe(duration)
+                job.runs += 1
+                job.last_duration = duration
+                job.total_duration += duration
+                job.max_duration = max(job.max_duration, duration)
+
+            # next slot strictly in the future; anything in between is missed
+            now = time.monotonic()
+            next_tick = max(tick + 1, math.floor((now - anchor) / interval) + 1)
+            if next_tick > tick + 1:
+                job.overruns += 1
+                job.skipped += next_tick - tick - 1
+            tick = next_tick
+            if not await self._sleep_until(anchor + tick * interval):
+                return
+
+
+# jobs are registered in app.main; started/stopped by the app lifespan
+scheduler = Scheduler()
@@ -1,40 +1,32 @@
-import csv
-import time
 import random
-from pathlib import Path
-from datetime import datetime
 import threading
+from datetime import datetime
+
+from app.services.event_hub import event_hub
+from app.services.metrics import rows_appended
+from app.services.sensor_store import sensor_store, to_epoch
+from app.services.snapshot import snapshot
+from app.storage import storage
+from app.storage.base import CHANNELS, SENSOR_TS_FORMAT
 
-BASE_DIR = Path(__file__).resolve().parent.parent.parent
-DATA_DIR = BASE_DIR / "data"
-SENSORS_FILE = DATA_DIR / "sensors.csv"
-
-HEADERS = [
-    "Timestamp",
-    "Accelerometer X (g)",
-    "Accelerometer Y (g)",
-    "Accelerometer Z (g)",
-    "Inclinometer (deg)",
-    "Extensometer (mm)",
-    "Piezometer (kPa)",
-    "Event Type",
+# ---- per-channel random walk, in CHANNELS order ----
+# (min, max, max step per reading, initial range, decimals)
+WALKS = [
+    (0.05, 0.4, 0.03, (0.15, 0.25), 3),
+    (0.05, 0.4, 0.03, (0.15, 0.25), 3),
+    (9.6, 10.2, 0.05, (9.7, 9.9), 3),
+    (20, 35, 0.5, (24, 28), 2),
+    (1.5, 3.5, 0.1, (2.0, 2.5), 2),
+    (120, 220, 3, (150, 180), 1),
 ]
 
-# ---- stateful baselines for smooth zig-zag ----
-_last_ax = random.uniform(0.15, 0.25)
-_last_ay = random.uniform(0.15, 0.25)
-_last_az = random.uniform(9.7, 9.9)
-_last_inc = random.uniform(24, 28)
-_last_ext = random.uniform(2.0, 2.5)
-_last_piez = random.uniform(150, 180)
+EVENT_TYPES = ["Normal", "Warning", "Critical"]
 
+# ---- stateful baselines for smooth zig-zag ----
+_last = [random.uniform(*initial) for _, _, _, initial, _ in WALKS]
 
-def ensure_csv():
-    if not SENSORS_FILE.exists():
-        DATA_DIR.mkdir(exist_ok=True)
-        with open(SENSORS_FILE, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(HEADERS)
+# ingested batches must not interleave, or timestamps could go backwards
+_ingest_lock = threading.Lock()
 
 
 def _jitter(value: float, min_v: float, max_v: float, step: float) -> float:
@@ -44,37 +36,47 @@ def _jitter(value: float, min_v: float, max_v: float, step: float) -> float:
 
 
 def generate_row():
-    global _last_ax, _last_ay, _last_az, _last_inc, _last_ext, _last_piez
-
     # small step changes -> zig-zag but smooth
-    _last_ax = _jitter(_last_ax, 0.05, 0.4, 0.03)
-    _last_ay = _jitter(_last_ay, 0.05, 0.4, 0.03)
-    _last_az = _jitter(_last_az, 9.6, 10.2, 0.05)
-    _last_inc = _jitter(_last_inc, 20, 35, 0.5)
-    _last_ext = _jitter(_last_ext, 1.5, 3.5, 0.1)
-    _last_piez = _jitter(_last_piez, 120, 220, 3)
+    for i, (min_v, max_v, step, _, _) in enumerate(WALKS):
+        _last[i] = _jitter(_last[i], min_v, max_v, step)
 
     return [
-        datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        round(_last_ax, 3),
-        round(_last_ay, 3),
-        round(_last_az, 3),
-        round(_last_inc, 2),
-        round(_last_ext, 2),
-        round(_last_piez, 1),
-        random.choice(["Normal", "Warning", "Critical"]),
+        datetime.now().strftime(SENSOR_TS_FORMAT),
+        *(round(value, walk[4]) for value, walk in zip(_last, WALKS)),
+        random.choice(EVENT_TYPES),
     ]
 
 
-def append_loop():
-    ensure_csv()
-    while True:
-        with open(SENSORS_FILE, "a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(generate_row())
-        time.sleep(5)  # every 5 seconds
+def ingest_rows(rows):
+    """
+    Push readings (rows laid out like SENSOR_HEADERS, oldest first)
+    through the live path: in-memory store, storage, snapshot, events.
+
+    Raises ValueError if the batch starts before the newest reading we
+    already have; every reader relies on timestamps never going back.
+    """
+    if not rows:
+        return
+    with _ingest_lock:
+        newest = sensor_store.newest()
+        if newest is not None and to_epoch(rows[0][0]) < newest:
+            raise ValueError("readings are older than the newest stored reading")
+
+        # readers take it from memory; storage is the durable copy
+        for row in rows:
+            sensor_store.append(row[0], row[1:7])
+        storage.append_readings(rows)
+        rows_appended.labels("readings").inc(len(rows))
+
+        last = rows[-1]
+        snapshot.write_reading(last[0].replace(" ", "T"), last[1:7])
+        for row in rows:
+            event_hub.publish("reading", {
+                "timestamp": row[0].replace(" ", "T"),
+                **dict(zip(CHANNELS, row[1:7])),
+            })
 
 
-def start_sensor_generator():
-    thread = threading.Thread(target=append_loop, daemon=True)
-    thread.start()
+def run_sensor_tick():
+    """Generate and publish one reading (scheduled every SENSOR_INTERVAL_SECONDS)."""
+    ingest_rows([generate_row()])
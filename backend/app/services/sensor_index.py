@@ -0,0 +1,202 @@
+import csv
+import os
+import threading
+from bisect import bisect_left
+from pathlib import Path
+
+import numpy as np
+
+from app.utils.csv_tail import open_range
+from app.utils.profiling import phase
+
+# one index entry every N data rows
+INDEX_EVERY = 64
+
+# sensors.csv timestamps look like "2025-11-11 22:41:41"; that layout sorts
+# lexicographically, so the index can compare raw strings without parsing
+TS_LEN = 19
+
+# the initial build scans the file in blocks of this many bytes
+SCAN_BLOCK = 1 << 20
+NEWLINE = ord("\n")
+COMMA = ord(",")
+
+
+def _line_ts(line: bytes):
+    if len(line) <= TS_LEN or line[TS_LEN:TS_LEN + 1] != b",":
+        return None
+    return line[:TS_LEN].decode("ascii", "replace")
+
+
+class SensorIndex:
+    """
+    Sparse index of sensors.csv: the timestamp and byte offset of every
+    INDEX_EVERY-th row.
+
+    The index is built once and then extended with whatever was appended
+    since the last refresh. Window queries binary-search it and seek
+    straight to the first candidate row, so reading the last hour parses
+    a few hundred rows instead of the whole file.
+
+    `committed` is an optional callable returning how many bytes of the
+    file are fully written (or None if unknown); the index never looks
+    past that offset.
+    """
+
+    def __init__(self, path, every: int = INDEX_EVERY, committed=None):
+        self.path = Path(path)
+        self.every = every
+        self.committed = committed
+        self.header = None
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self, file_id=None):
+        self.header = None
+        self._file_id = file_id
+        self._times = []
+        self._offsets = []
+        self._data_start = 0
+        self._end = 0
+        self._rows = 0
+
+    @property
+    def row_count(self) -> int:
+        return self._rows
+
+    def refresh(self):
+        """Index rows appended since the previous refresh."""
+        with self._lock, phase("index"):
+            try:
+                st = os.stat(self.path)
+            except FileNotFoundError:
+                self._reset()
+                return
+
+            size = st.st_size
+            if self.committed is not None:
+                watermark = self.committed()
+                if watermark is not None:
+                    size = min(size, watermark)
+
+            file_id = (st.st_dev, st.st_ino)
+            if file_id != self._file_id or size < self._end:
+                self._reset(file_id)
+            if size == self._end:
+                return
+
+            with open(self.path, "rb") as f:
+                if self.header is not None:
+                    # a replaced file can reuse the inode; our offset must
+                    # still sit right after a line break
+                    f.seek(self._end - 1)
+                    if f.read(1) != b"\n":
+                        self._reset(file_id)
+
+                if self.header is None:
+                    f.seek(0)
+                    first = f.readline(size)
+                    if not first.endswith(b"\n"):
+                        return
+                    self.header = next(csv.reader([first.decode("utf-8")]))
+                    self._data_start = self._end = f.tell()
+
+                offset = self._end
+                while offset < size:
+                    f.seek(offset)
+                    block = f.read(min(SCAN_BLOCK, size - offset))
+                    complete = block.rfind(b"\n") + 1
+                    if complete == 0:
+                        break  # nothing new, or a line still being written
+                    self._index_block(block[:complete], offset)
+                    offset += complete
+                self._end = offset
+
+    def _index_block(self, block: bytes, offset: int):
+        """Index a run of complete lines starting at file offset `offset`."""
+        arr = np.frombuffer(block, dtype=np.uint8)
+        ends = np.flatnonzero(arr == NEWLINE)
+        starts = np.r_[0, ends[:-1] + 1]
+        # same rule as _line_ts: a timestamp followed by a comma
+        probe = starts + TS_LEN
+        valid = probe < ends
+        valid[valid] = arr[probe[valid]] == COMMA
+        row_starts = starts[valid]
+
+        first = (-self._rows) % self.every
+        for start in row_starts[first::self.every].tolist():
+            self._times.append(block[start:start + TS_LEN].decode("ascii", "replace"))
+            self._offsets.append(offset + start)
+        self._rows += len(row_starts)
+
+    def _start_offset(self, lower):
+        if lower is None or not self._times:
+            return self._data_start
+        i = bisect_left(self._times, lower)
+        # the entry before i is the last one known to be older than `lower`
+        return self._offsets[i - 1] if i > 0 else self._data_start
+
+    def locate(self, start=None):
+        """
+        (header, offset, end) for reading sensors.csv from just before the
+        first row at or after `start`, up to the last complete line.
+        """
+        self.refresh()
+        with self._lock:
+            return self.header, self._start_offset(start), self._end
+
+    def iter_rows(self, start=None, end=None, after=None, limit=None):
+        """
+        Yield rows (dicts keyed by the CSV header) whose timestamp lies in
+        [start, end], strictly after `after`, oldest first. Bounds are
+        strings in the sensors.csv timestamp layout.
+        """
+        self.refresh()
+        with self._lock:
+            header = self.header
+            stop = self._end
+            lower = max(start, after) if start and after else (start or after)
+            offset = self._start_offset(lower)
+        if header is None:
+            return
+
+        count = 0
+        with open_range(self.path, offset, stop) as f:
+            while offset < stop and (limit is None or count < limit):
+                line = f.readline()
+                offset += len(line)
+                ts = _line_ts(line)
+                if ts is None:
+                    continue
+                if (start is not None and ts < start) or (after is not None and ts <= after):
+                    continue
+                if end is not None and ts > end:
+                    break
+                values = next(csv.reader([line.decode("utf-8")]))
+                count += 1
+                yield dict(zip(header, values))
+
+    def iter_last(self, n: int):
+        """Yield the newest `n` rows, oldest first."""
+        self.refresh()
+        with self._lock:
+            header = self.header
+            stop = self._end
+            first_row = max(0, self._rows - n)
+            entry = first_row // self.every
+            offset = self._offsets[entry] if self._offsets else self._data_start
+            skip = first_row - entry * self.every
+        if header is None:
+            return
+
+        with open_range(self.path, offset, stop) as f:
+            while offset < stop:
+                line = f.readline()
+                offset += len(line)
+                if _line_ts(line) is None:
+                    continue
+                if skip:
+                    skip -= 1
+                    continue
+                yield dict(zip(header, next(csv.reader([line.decode("utf-8")]))))
+
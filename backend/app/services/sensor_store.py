@@ -0,0 +1,172 @@
+import threading
+from datetime import datetime
+
+import numpy as np
+
+from app.config import SENSOR_STORE_CAPACITY
+from app.storage import storage as default_storage
+from app.storage.base import CHANNELS
+
+
+def to_epoch(timestamp) -> int:
+    """
+    Seconds since 1970 for a naive wall-clock timestamp (a sensors.csv
+    or ISO string, or a datetime). Timezone info is ignored, matching
+    the stored data.
+    """
+    if isinstance(timestamp, str):
+        if len(timestamp) != 19 or timestamp[10] not in " T":
+            raise ValueError(f"unexpected timestamp {timestamp!r}")
+    else:
+        timestamp = timestamp.replace(tzinfo=None)
+    return int(np.datetime64(timestamp, "s").astype(np.int64))
+
+
+class SensorStore:
+    """
+    Recent sensor readings held in preallocated NumPy ring buffers: int64
+    epoch seconds plus one float64 column per channel.
+
+    Every slot is written twice (at i and i + capacity), so the newest n
+    rows are always one contiguous range and can be sliced without
+    wrapping. A view of them is only safe from the next `capacity - n`
+    appends (none once the buffer is full), so reads search and copy the
+    rows they return while holding the lock. Memory use is fixed at
+    2 * capacity * (8 + 6 * 8) bytes.
+
+    The store is warmed from the newest stored readings on first use;
+    after that the sensor generator appends to it directly.
+    """
+
+    def __init__(self, capacity: int = SENSOR_STORE_CAPACITY, storage=default_storage):
+        self.capacity = capacity
+        self._storage = storage
+        self._lock = threading.Lock()
+        self._t = np.zeros(2 * capacity, dtype=np.int64)
+        self._cols = np.zeros((len(CHANNELS), 2 * capacity), dtype=np.float64)
+        self._pos = 0  # next slot to write, in [0, capacity)
+        self._size = 0
+        self._seq = 0  # rows ever appended
+        self._dropped = False  # has history fallen out of the buffer?
+        self._loaded = False
+
+    # ---------- writing ----------
+
+    def _write(self, epoch: int, values):
+        p = self._pos
+        self._t[p] = self._t[p + self.capacity] = epoch
+        self._cols[:, p] = self._cols[:, p + self.capacity] = values
+        self._pos = (p + 1) % self.capacity
+        if self._size == self.capacity:
+            self._dropped = True
+        else:
+            self._size += 1
+        self._seq += 1
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._dropped = self._storage.reading_count() > self.capacity
+            for reading in self._storage.iter_last_readings(self.capacity):
+                self._write(
+                    to_epoch(reading["timestamp"]),
+                    [reading[name] for name in CHANNELS],
+                )
+            self._loaded = True
+
+    def append(self, timestamp: str, values):
+        """Add one reading; `timestamp` uses the sensors.csv layout."""
+        self._ensure_loaded()
+        with self._lock:
+            self._write(to_epoch(timestamp), values)
+
+    def catch_up(self) -> list[dict]:
+        """
+        Append readings another process stored after our newest one (see
+        follower_sync) and return them in API shape.
+        """
+        self._ensure_loaded()
+        with self._lock:
+            t, _ = self._tail(self._size)
+            last = int(t[-1]) if len(t) else None
+            # rows sharing the newest second that we already hold
+            seen = len(t) - int(np.searchsorted(t, last, side="left")) if len(t) else 0
+
+        start = None if last is None else np.datetime64(last, "s").astype(datetime)
+        new = []
+        for reading in self._storage.iter_readings(start=start):
+            epoch = to_epoch(reading["timestamp"])
+            if epoch == last and seen:
+                seen -= 1
+                continue
+            with self._lock:
+                self._write(epoch, [reading[name] for name in CHANNELS])
+            new.append(reading)
+        return new
+
+    # ---------- reading ----------
+
+    @property
+    def seq(self) -> int:
+        """Total number of rows ever appended; use as a cursor for since()."""
+        self._ensure_loaded()
+        return self._seq
+
+    def _tail(self, n: int):
+        end = self._pos + self.capacity
+        return self._t[end - n:end], self._cols[:, end - n:end]
+
+    def since(self, seq: int):
+        """
+        Rows appended after cursor `seq`, as (new_seq, t, cols) copies
+        where `cols` has shape (channels, n). Rows that already fell out
+        of the buffer are skipped.
+        """
+        self._ensure_loaded()
+        with self._lock:
+            n = min(self._seq - seq, self._size)
+            t, cols = self._tail(max(n, 0))
+            return self._seq, t.copy(), cols.copy()
+
+    def newest(self):
+        """Epoch seconds of the newest reading, or None if empty."""
+        self._ensure_loaded()
+        with self._lock:
+            if self._size == 0:
+                return None
+            return int(self._t[self._pos + self.capacity - 1])
+
+    def covers(self, start_epoch) -> bool:
+        """Can a window starting at `start_epoch` be served from memory?"""
+        self._ensure_loaded()
+        with self._lock:
+            if not self._dropped:
+                return True
+            if start_epoch is None or self._size == 0:
+                return False
+            # older readings at the oldest second we hold may be gone
+            return start_epoch > self._tail(self._size)[0][0]
+
+    def window(self, start=None, end=None, after=None):
+        """
+        Readings with start <= t <= end and t > after (epoch seconds,
+        each optional), as (t, cols) copies that later appends can't touch.
+        """
+        self._ensure_loaded()
+        with self._lock:
+            t, cols = self._tail(self._size)
+            lo = 0
+            if start is not None:
+                lo = int(np.searchsorted(t, start, side="left"))
+            if after is not None:
+                lo = max(lo, int(np.searchsorted(t, after, side="right")))
+            hi = len(t) if end is None else int(np.searchsorted(t, end, side="right"))
+            hi = max(lo, hi)
+            return t[lo:hi].copy(), cols[:, lo:hi].copy()
+
+
+# process-wide store shared by the generator, the API and the prediction loop
+sensor_store = SensorStore()
@@ -0,0 +1,156 @@
+import mmap
+import os
+import struct
+import threading
+import time
+
+from app.config import SNAPSHOT_FILE
+from app.storage.base import CHANNELS, PREDICTION_HEADERS
+
+MAGIC = b"TWSS"
+VERSION = 1
+
+# magic, layout version; then the seqlock counter (odd while a write is
+# in progress) and the unix time of the last write
+HEADER = struct.Struct("<4sI")
+SEQ = struct.Struct("<Q")
+UPDATED = struct.Struct("<d")
+# present, ISO timestamp, one float per channel
+READING = struct.Struct("<?19s6d")
+# present, ISO timestamp, probability, four risk levels, x, y, z
+PREDICTION = struct.Struct("<?32sd12s12s12s12s3d")
+
+SEQ_OFFSET = HEADER.size  # 8-byte aligned, so it is stored in one go
+UPDATED_OFFSET = SEQ_OFFSET + SEQ.size
+READING_OFFSET = UPDATED_OFFSET + UPDATED.size
+PREDICTION_OFFSET = READING_OFFSET + READING.size
+SIZE = PREDICTION_OFFSET + PREDICTION.size
+
+# a reader gives up after this many torn reads (writer stalled mid-write)
+MAX_RETRIES = 1000
+
+
+def _text(raw: bytes) -> str:
+    return raw.rstrip(b"\0").decode("ascii")
+
+
+class Snapshot:
+    """
+    The latest reading and prediction in a small mmap-ed file shared by
+    all worker processes.
+
+    The leader writes with a seqlock: bump the counter to odd, write the
+    fields, bump it to even. Readers copy the record and retry if the
+    counter was odd or changed meanwhile, so they always get a consistent
+    snapshot without locks and without touching the CSVs; a read is a
+    couple of struct unpacks.
+
+    Shared bytes are only ever written by slice assignment: pack_into
+    zero-fills its target before filling it in, which readers could see.
+    """
+
+    def __init__(self, path=SNAPSHOT_FILE):
+        self.path = path
+        self._mm = None
+        self._lock = threading.Lock()
+
+    def _map(self):
+        if self._mm is None:
+            with self._lock:
+                if self._mm is None:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                    try:
+                        if os.fstat(fd).st_size < SIZE:
+                            os.ftruncate(fd, SIZE)
+                        self._mm = mmap.mmap(fd, SIZE)
+                    finally:
+                        os.close(fd)  # the mapping stays valid
+        return self._mm
+
+    # ---------- writer (leader only) ----------
+
+    def _seq(self, mm) -> int:
+        return SEQ.unpack(mm[SEQ_OFFSET:SEQ_OFFSET + SEQ.size])[0]
+
+    def _write(self, offset: int, packed: bytes):
+        mm = self._map()
+        with self._lock:
+            seq = self._seq(mm)
+            if HEADER.unpack_from(mm, 0) != (MAGIC, VERSION) or seq % 2:
+                # new file, old layout or a writer that died mid-write
+                mm[:SIZE] = bytes(SIZE)
+                mm[:HEADER.size] = HEADER.pack(MAGIC, VERSION)
+                seq = 0
+            mm[SEQ_OFFSET:SEQ_OFFSET + SEQ.size] = SEQ.pack(seq + 1)
+            mm[UPDATED_OFFSET:UPDATED_OFFSET + UPDATED.size] = UPDATED.pack(time.time())
+            mm[offset:offset + len(packed)] = packed
+            mm[SEQ_OFFSET:SEQ_OFFSET + SEQ.size] = SEQ.pack(seq + 2)
+
+    def write_reading(self, timestamp: str, values):
+        """Publish a reading; `timestamp` is ISO ("2025-11-11T22:41:41")."""
+        packed = READING.pack(True, timestamp.encode("ascii"), *values)
+        self._write(READING_OFFSET, packed)
+
+    def write_prediction(self, prediction: dict):
+        """Publish a prediction dict keyed by PREDICTION_HEADERS."""
+        packed = PREDICTION.pack(
+            True,
+            prediction["timestamp"].encode("ascii"),
+            float(prediction["probability"]),
+            *(prediction[key].encode("ascii") for key in PREDICTION_HEADERS[2:6]),
+            *(float(prediction[key]) for key in PREDICTION_HEADERS[6:]),
+        )
+        self._write(PREDICTION_OFFSET, packed)
+
+    # ---------- readers (any worker) ----------
+
+    def read(self):
+        """
+        {"seq", "updated", "reading", "prediction"} as of the last
+        complete write (reading/prediction None until first written), or
+        None if nothing was ever written.
+        """
+        mm = self._map()
+        if HEADER.unpack_from(mm, 0) != (MAGIC, VERSION):
+            return None
+        for _ in range(MAX_RETRIES):
+            seq = self._seq(mm)
+            if seq % 2:
+                continue
+            record = mm[UPDATED_OFFSET:SIZE]
+            if self._seq(mm) == seq:
+                break
+        else:
+            return None
+        if seq == 0:
+            return None
+
+        (updated,) = UPDATED.unpack_from(record, 0)
+        reading = READING.unpack_from(record, UPDATED.size)
+        prediction = PREDICTION.unpack_from(record, UPDATED.size + READING.size)
+        return {
+            "seq": seq,
+            "updated": updated,
+            "reading": {
+                "timestamp": _text(reading[1]),
+                **dict(zip(CHANNELS, reading[2:])),
+            } if reading[0] else None,
+            "prediction": {
+                "timestamp": _text(prediction[1]),
+                "probability": prediction[2],
+                **{key: _text(v) for key, v in zip(PREDICTION_HEADERS[2:6], prediction[3:7])},
+                **dict(zip(PREDICTION_HEADERS[6:], prediction[7:])),
+            } if prediction[0] else None,
+        }
+
+    def latest_prediction(self):
+        snap = self.read()
+        return None if snap is None else snap["prediction"]
+
+    def latest_reading(self):
+        snap = self.read()
+        return None if snap is None else snap["reading"]
+
+
+snapshot = Snapshot()
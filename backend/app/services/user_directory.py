@@ -0,0 +1,62 @@
+import threading
+
+from app.storage import storage as default_storage
+
+
+class DuplicateEmailError(ValueError):
+    """Raised when registering an email that already has an account."""
+
+
+class UserDirectory:
+    """
+    Users keyed by email in a dict, so login and duplicate checks are
+    O(1) however many accounts exist. Emails match exactly, as they did
+    when login scanned storage.
+
+    The dict is built from storage on first use and rebuilt whenever
+    storage's users_version() changes behind our back (another process
+    or a hand edit of users.csv); our own registrations update it in
+    place. Registration holds a lock across check-and-append, so two
+    concurrent requests cannot create the same account.
+    """
+
+    def __init__(self, storage=default_storage):
+        self._storage = storage
+        self._lock = threading.Lock()
+        self._users = {}
+        self._version = None
+        self._loaded = False
+
+    def _refresh(self):
+        # caller holds the lock
+        version = self._storage.users_version()
+        if self._loaded and version == self._version:
+            return
+        users = {}
+        for user in self._storage.iter_users():
+            # on duplicates the first registration wins, as before
+            users.setdefault(user["email"], user)
+        self._users = users
+        self._version = version
+        self._loaded = True
+
+    def find(self, email: str):
+        """The user registered with `email`, or None."""
+        with self._lock:
+            self._refresh()
+            return self._users.get(email)
+
+    def register(self, user: dict):
+        """Store a new user; raises DuplicateEmailError if the email is taken."""
+        with self._lock:
+            self._refresh()
+            email = user["email"]
+            if email in self._users:
+                raise DuplicateEmailError(email)
+            self._storage.add_user(user)
+            self._users[email] = dict(user)
+            self._version = self._storage.users_version()
+
+
+# shared by /login and both /register handlers
+user_directory = UserDirectory()
@@ -0,0 +1,16 @@
+from app.config import DATA_DIR, SQLITE_PATH, STORAGE_BACKEND
+from app.storage.base import Storage
+
+
+def create_storage(backend: str = STORAGE_BACKEND) -> Storage:
+    """Build the backend selected by STORAGE_BACKEND."""
+    if backend == "csv":
+        from app.storage.csv_backend import CsvStorage
+        return CsvStorage(DATA_DIR)
+    if backend == "sqlite":
+        from app.storage.sqlite_backend import SqliteStorage
+        return SqliteStorage(SQLITE_PATH)
+    raise ValueError(f"Unknown STORAGE_BACKEND {backend!r} (expected 'csv' or 'sqlite')")
+
+
+storage = create_storage()
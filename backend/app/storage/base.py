@@ -0,0 +1,144 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+# ===============================
+# RECORD LAYOUTS
+# ===============================
+
+# sensors.csv columns; rows passed to append_readings use this order
+SENSOR_HEADERS = [
+    "Timestamp",
+    "Accelerometer X (g)",
+    "Accelerometer Y (g)",
+    "Accelerometer Z (g)",
+    "Inclinometer (deg)",
+    "Extensometer (mm)",
+    "Piezometer (kPa)",
+    "Event Type",
+]
+
+# API field -> sensors.csv column, in model feature order
+CHANNELS = {
+    "accelerometerX": "Accelerometer X (g)",
+    "accelerometerY": "Accelerometer Y (g)",
+    "accelerometerZ": "Accelerometer Z (g)",
+    "inclinometer": "Inclinometer (deg)",
+    "extensometer": "Extensometer (mm)",
+    "piezometer": "Piezometer (kPa)",
+}
+
+PREDICTION_HEADERS = [
+    "timestamp",
+    "probability",
+    "next3Hours",
+    "next6Hours",
+    "next12Hours",
+    "next24Hours",
+    "locationX",
+    "locationY",
+    "locationZ",
+]
+
+NOTIFICATION_HEADERS = ["timestamp", "level", "message"]
+
+USER_HEADERS = ["firstName", "lastName", "email", "password", "employeeId"]
+
+# sensor timestamps are stored as "2025-11-11 22:41:41"
+SENSOR_TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def format_sensor_ts(value: datetime | None):
+    """Render a query bound in the stored sensor timestamp layout."""
+    if value is None:
+        return None
+    return value.strftime(SENSOR_TS_FORMAT)
+
+
+class Storage(ABC):
+    """
+    Where sensors, predictions, notifications and users are persisted.
+
+    Reading records come back in API shape: {"timestamp": ISO string,
+    "accelerometerX": float, ...}. Predictions, notifications and users
+    come back as dicts keyed by PREDICTION_HEADERS, NOTIFICATION_HEADERS
+    and USER_HEADERS. Time bounds are naive datetimes (or None).
+    """
+
+    def flush(self):
+        """Block until every accepted append is written; a no-op by default."""
+
+    def file_sizes(self) -> dict:
+        """{file name: bytes} of the files backing this storage, for metrics."""
+        return {}
+
+    # ---------- sensor readings ----------
+
+    @abstractmethod
+    def append_readings(self, rows):
+        """Append rows laid out like SENSOR_HEADERS."""
+
+    @abstractmethod
+    def iter_readings(self, start=None, end=None, after=None, limit=None):
+        """Readings with start <= t <= end and t > after, oldest first."""
+
+    @abstractmethod
+    def iter_last_readings(self, n: int):
+        """The newest `n` readings, oldest first."""
+
+    @abstractmethod
+    def reading_count(self) -> int:
+        """Number of stored readings."""
+
+    @abstractmethod
+    def readings_version(self):
+        """A cheap token that changes whenever readings are added."""
+
+    @abstractmethod
+    def iter_reading_chunks(self, start=None, end=None, chunk_size: int = 50_000):
+        """
+        Readings in [start, end] as (timestamps, features) chunks: an array
+        of stored timestamp strings and a float (n, 6) matrix in CHANNELS
+        order. Used for bulk scoring.
+        """
+
+    # ---------- predictions ----------
+
+    @abstractmethod
+    def append_predictions(self, rows):
+        """Append rows laid out like PREDICTION_HEADERS."""
+
+    @abstractmethod
+    def latest_prediction(self):
+        """The newest prediction, or None."""
+
+    @abstractmethod
+    def iter_predictions(self):
+        """All predictions, oldest first."""
+
+    # ---------- notifications ----------
+
+    @abstractmethod
+    def append_notification(self, timestamp: str, level: str, message: str):
+        """Append one notification."""
+
+    @abstractmethod
+    def iter_notifications(self, start: int = 0):
+        """Notifications oldest first, skipping the first `start`."""
+
+    # ---------- users ----------
+
+    @abstractmethod
+    def find_user(self, email: str):
+        """The first user registered with `email`, or None."""
+
+    @abstractmethod
+    def add_user(self, user: dict):
+        """Store a user dict keyed by USER_HEADERS."""
+
+    @abstractmethod
+    def iter_users(self):
+        """All users, in registration order."""
+
+    @abstractmethod
+    def users_version(self):
+        """A cheap token that changes whenever users are added."""
@@ -0,0 +1,259 @@
+import csv
+import os
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.services.sensor_index import SensorIndex
+from app.storage.base import (
+    CHANNELS,
+    NOTIFICATION_HEADERS,
+    PREDICTION_HEADERS,
+    SENSOR_HEADERS,
+    USER_HEADERS,
+    Storage,
+    format_sensor_ts,
+)
+from app.storage.writer import GroupCommitWriter
+from app.utils.csv_tail import last_newline, open_range, read_last_row
+from app.utils.profiling import timed_fn, timed_iter
+
+
+def parse_float(value):
+    try:
+        return float(str(value).strip())
+    except Exception:
+        return None
+
+
+def parse_timestamp(value):
+    # same "%Y-%m-%d %H:%M:%S" layout as before, but fromisoformat is
+    # much cheaper than strptime on this hot path
+    try:
+        if len(value) != 19 or value[10] != " ":
+            return None
+        return datetime.fromisoformat(value).isoformat()
+    except Exception:
+        return None
+
+
+def to_reading(row: dict):
+    """API-shaped reading for a sensors.csv row, or None if malformed."""
+    timestamp = parse_timestamp(row.get("Timestamp"))
+
+    if not timestamp:
+        return None
+
+    values = [parse_float(row.get(column)) for column in CHANNELS.values()]
+    if None in values:
+        return None
+
+    return {"timestamp": timestamp, **dict(zip(CHANNELS, values))}
+
+
+def _file_version(path):
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class CsvStorage(Storage):
+    """
+    The original append-only CSV files in DATA_DIR.
+
+    Sensor range queries go through a sparse timestamp index and the
+    latest prediction is found by seeking back from EOF; everything else
+    is a sequential scan.
+
+    All appends go through one group-commit writer thread. While ours
+    are in flight, reads stop at the writer's committed offset for the
+    file; otherwise they go to its last complete line, so rows appended
+    by other workers are seen.
+    """
+
+    def __init__(self, data_dir, writer: GroupCommitWriter | None = None):
+        data_dir = Path(data_dir)
+        self.sensors_file = data_dir / "sensors.csv"
+        self.predictions_file = data_dir / "prediction.csv"
+        self.notifications_file = data_dir / "notifications.csv"
+        self.users_file = data_dir / "users.csv"
+        # (file id, rows read, byte offset, header) after the last full
+        # iter_notifications, so the follower's next sync starts there
+        self._notifications_cursor = None
+        self.writer = writer or GroupCommitWriter()
+        self.sensor_index = SensorIndex(
+            self.sensors_file,
+            committed=lambda: self.writer.committed(self.sensors_file),
+        )
+
+    def _read_end(self, path: Path) -> int:
+        end = self.writer.committed(path)
+        if end is None:
+            # nothing of ours in flight: stop at the last complete line
+            with open(path, "rb") as f:
+                end = last_newline(f, f.seek(0, os.SEEK_END))
+        return end
+
+    def _iter_dicts(self, path: Path, start: int = 0):
+        if not path.exists():
+            return
+        with open_range(path, end=self._read_end(path), text=True) as f:
+            yield from timed_iter("csv", islice(csv.DictReader(f), start, None))
+
+    def flush(self):
+        """Block until every queued append is on disk."""
+        self.writer.flush()
+
+    def file_sizes(self) -> dict:
+        files = [self.sensors_file, self.predictions_file, self.notifications_file, self.users_file]
+        return {path.name: path.stat().st_size for path in files if path.exists()}
+
+    # ---------- sensor readings ----------
+
+    def append_readings(self, rows):
+        self.writer.submit(self.sensors_file, SENSOR_HEADERS, rows)
+
+    def iter_readings(self, start=None, end=None, after=None, limit=None):
+        rows = self.sensor_index.iter_rows(
+            start=format_sensor_ts(start),
+            end=format_sensor_ts(end),
+            after=format_sensor_ts(after),
+        )
+        convert = timed_fn("convert", to_reading)
+        count = 0
+        for row in timed_iter("csv", rows):
+            reading = convert(row)
+            if reading is None:
+                continue
+            yield reading
+            count += 1
+            if limit is not None and count >= limit:
+                return
+
+    def iter_last_readings(self, n: int):
+        for row in self.sensor_index.iter_last(n):
+            reading = to_reading(row)
+            if reading is not None:
+                yield reading
+
+    def reading_count(self) -> int:
+        self.sensor_index.refresh()
+        return self.sensor_index.row_count
+
+    def readings_version(self):
+        # reads stop at the committed offset, which moves after the bytes land
+        return self.writer.committed(self.sensors_file), _file_version(self.sensors_file)
+
+    def iter_reading_chunks(self, start=None, end=None, chunk_size: int = 50_000):
+        start, end = format_sensor_ts(start), format_sensor_ts(end)
+        header, offset, stop = self.sensor_index.locate(start)
+        if header is None:
+            return
+
+        features = list(CHANNELS.values())
+        with open_range(self.sensors_file, offset, stop) as f:
+            chunks = pd.read_csv(
+                f,
+                names=header,
+                header=None,
+                usecols=["Timestamp", *features],
+                dtype={"Timestamp": str},
+                chunksize=chunk_size,
+            )
+            for df in chunks:
+                # drops malformed rows and a line that is still being written
+                for col in features:
+                    df[col] = pd.to_numeric(df[col], errors="coerce")
+                df = df.dropna()
+                df = df[df["Timestamp"].str.len() == 19]
+
+                if start is not None:
+                    df = df[df["Timestamp"] >= start]
+                past_end = None
+                if end is not None:
+                    past_end = (df["Timestamp"] > end).to_numpy()
+                    df = df[~past_end]
+                yield df["Timestamp"].to_numpy(), df[features].to_numpy(dtype=np.float64)
+                if past_end is not None and past_end.any():
+                    # timestamps only grow, so nothing later can match
+                    return
+
+    # ---------- predictions ----------
+
+    def append_predictions(self, rows):
+        self.writer.submit(self.predictions_file, PREDICTION_HEADERS, rows)
+
+    def latest_prediction(self):
+        return read_last_row(
+            self.predictions_file,
+            end=self.writer.committed(self.predictions_file),
+        )
+
+    def iter_predictions(self):
+        return self._iter_dicts(self.predictions_file)
+
+    # ---------- notifications ----------
+
+    def append_notification(self, timestamp: str, level: str, message: str):
+        self.writer.submit(
+            self.notifications_file,
+            NOTIFICATION_HEADERS,
+            [[timestamp, level, message]],
+        )
+
+    def iter_notifications(self, start: int = 0):
+        """
+        Notifications from row `start` on. A call that continues where
+        the previous one ended (the follower's sync) seeks to that byte
+        offset and parses only the new rows.
+        """
+        path = self.notifications_file
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return
+        file_id = (st.st_dev, st.st_ino)
+        end = self._read_end(path)
+
+        cursor = self._notifications_cursor
+        if cursor is not None and cursor[:2] == (file_id, start) and cursor[2] <= end:
+            _, rows, offset, header = cursor
+        else:
+            rows, offset, header = 0, 0, None
+
+        with open_range(path, offset, end, text=True) as f:
+            reader = csv.DictReader(f, fieldnames=header)
+            for row in timed_iter("csv", reader):
+                if rows >= start:
+                    yield row
+                rows += 1
+            header = reader.fieldnames
+        self._notifications_cursor = (file_id, rows, end, header)
+
+    # ---------- users ----------
+
+    def find_user(self, email: str):
+        for user in self.iter_users():
+            if user.get("email") == email:
+                return user
+        return None
+
+    def add_user(self, user: dict):
+        # registration must be on disk before we report success
+        self.writer.submit(
+            self.users_file,
+            USER_HEADERS,
+            [[user[key] for key in USER_HEADERS]],
+            wait=True,
+        )
+
+    def iter_users(self):
+        return self._iter_dicts(self.users_file)
+
+    def users_version(self):
+        return _file_version(self.users_file)
@@ -0,0 +1,82 @@
+"""
+Copy the CSV data files into the SQLite database.
+
+    python -m app.storage.migrate [--data-dir DIR] [--db PATH]
+
+Run it once before switching STORAGE_BACKEND to "sqlite". The CSV files
+are left untouched; a database that already holds data is refused.
+"""
+import argparse
+import csv
+import time
+from itertools import islice
+
+from app.config import DATA_DIR, SQLITE_PATH
+from app.storage.base import NOTIFICATION_HEADERS, PREDICTION_HEADERS, SENSOR_HEADERS
+from app.storage.csv_backend import CsvStorage, parse_float
+from app.storage.sqlite_backend import SqliteStorage
+
+BATCH_SIZE = 10_000
+
+
+def _batches(rows, size=BATCH_SIZE):
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def _sensor_rows(path):
+    """sensors.csv rows in SENSOR_HEADERS order, skipping malformed ones."""
+    if not path.exists():
+        return
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            timestamp = row.get("Timestamp") or ""
+            values = [parse_float(row.get(column)) for column in SENSOR_HEADERS[1:7]]
+            if len(timestamp) != 19 or None in values:
+                continue
+            yield [timestamp, *values, row.get("Event Type")]
+
+
+def migrate(source: CsvStorage, target: SqliteStorage) -> dict:
+    """Copy every record from `source` into `target`; returns row counts."""
+    if target.reading_count() or target.latest_prediction() is not None:
+        raise SystemExit(f"{target.path} already has data; refusing to migrate into it")
+
+    counts = {"readings": 0, "predictions": 0, "notifications": 0, "users": 0}
+
+    for batch in _batches(_sensor_rows(source.sensors_file)):
+        target.append_readings(batch)
+        counts["readings"] += len(batch)
+
+    predictions = ([row[key] for key in PREDICTION_HEADERS] for row in source.iter_predictions())
+    for batch in _batches(predictions):
+        target.append_predictions(batch)
+        counts["predictions"] += len(batch)
+
+    notifications = ([row[key] for key in NOTIFICATION_HEADERS] for row in source.iter_notifications())
+    for batch in _batches(notifications):
+        target.append_notifications(batch)
+        counts["notifications"] += len(batch)
+
+    for user in source.iter_users():
+        target.add_user(user)
+        counts["users"] += 1
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data-dir", default=DATA_DIR, help=f"CSV directory (default: {DATA_DIR})")
+    parser.add_argument("--db", default=SQLITE_PATH, help=f"SQLite database (default: {SQLITE_PATH})")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    counts = migrate(CsvStorage(args.data_dir), SqliteStorage(args.db))
+    summary = ", ".join(f"{n} {name}" for name, n in counts.items())
+    print(f"Copied {summary} into {args.db} in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+import sqlite3
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from app.storage.base import (
+    CHANNELS,
+    NOTIFICATION_HEADERS,
+    PREDICTION_HEADERS,
+    SENSOR_HEADERS,
+    USER_HEADERS,
+    Storage,
+    format_sensor_ts,
+)
+from app.utils.profiling import timed_iter
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS readings (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    accelerometerX REAL NOT NULL,
+    accelerometerY REAL NOT NULL,
+    accelerometerZ REAL NOT NULL,
+    inclinometer REAL NOT NULL,
+    extensometer REAL NOT NULL,
+    piezometer REAL NOT NULL,
+    eventType TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_readings_timestamp ON readings (timestamp);
+
+CREATE TABLE IF NOT EXISTS predictions (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    probability REAL NOT NULL,
+    next3Hours TEXT NOT NULL,
+    next6Hours TEXT NOT NULL,
+    next12Hours TEXT NOT NULL,
+    next24Hours TEXT NOT NULL,
+    locationX REAL NOT NULL,
+    locationY REAL NOT NULL,
+    locationZ REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_predictions_timestamp ON predictions (timestamp);
+
+CREATE TABLE IF NOT EXISTS notifications (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    level TEXT NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_notifications_timestamp ON notifications (timestamp);
+CREATE INDEX IF NOT EXISTS idx_notifications_level ON notifications (level, timestamp);
+
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    firstName TEXT NOT NULL,
+    lastName TEXT NOT NULL,
+    email TEXT NOT NULL,
+    password TEXT NOT NULL,
+    employeeId TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_users_email ON users (email);
+"""
+
+READING_COLUMNS = ["timestamp", *CHANNELS, "eventType"]
+
+# rows fetched per round trip by the streaming iterators
+STREAM_CHUNK = 1000
+
+
+def _sensor_ts_to_iso(value: str) -> str:
+    return value[:10] + "T" + value[11:]
+
+
+class SqliteStorage(Storage):
+    """
+    Everything in one SQLite database in WAL mode, so the background
+    writers and request handlers can read and write concurrently.
+    Range queries, latest-row lookups and logins use indexes.
+
+    Each thread gets its own connection; appends are batched into a
+    single transaction per call. The iter_* generators open a connection
+    of their own instead, because a response stream may advance them
+    from a different threadpool thread on every step.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def file_sizes(self) -> dict:
+        files = [self.path, self.path.with_name(self.path.name + "-wal")]
+        return {path.name: path.stat().st_size for path in files if path.exists()}
+
+    def _query(self, sql, params=()):
+        return self._connect().execute(sql, params)
+
+    def _fetch_chunks(self, sql, params=(), chunk: int = STREAM_CHUNK, row_factory=sqlite3.Row):
+        """
+        Yield the rows of a query as lists of up to `chunk` rows, from a
+        connection private to this generator: any thread may resume it
+        (one at a time). Closed when the generator finishes or is dropped.
+        """
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        try:
+            conn.row_factory = row_factory
+            cursor = conn.execute(sql, params)
+            while rows := cursor.fetchmany(chunk):
+                yield rows
+        finally:
+            conn.close()
+
+    def _insert(self, table, columns, rows):
+        placeholders = ", ".join("?" for _ in columns)
+        names = ", ".join(columns)
+        with self._connect() as conn:
+            conn.executemany(f"INSERT INTO {table} ({names}) VALUES ({placeholders})", rows)
+
+    # ---------- sensor readings ----------
+
+    def append_readings(self, rows):
+        # same layout as SENSOR_HEADERS; only the column names differ
+        rows = [list(row) for row in rows]
+        for row in rows:
+            if len(row) != len(READING_COLUMNS):
+                raise ValueError(f"reading rows need {len(READING_COLUMNS)} values, got {len(row)}")
+        self._insert("readings", READING_COLUMNS, rows)
+
+    def _reading(self, row):
+        reading = dict(zip(CHANNELS, row[1:7]))
+        return {"timestamp": _sensor_ts_to_iso(row[0]), **reading}
+
+    def iter_readings(self, start=None, end=None, after=None, limit=None):
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(format_sensor_ts(start))
+        if end is not None:
+            clauses.append("timestamp <= ?")
+            params.append(format_sensor_ts(end))
+        if after is not None:
+            clauses.append("timestamp > ?")
+            params.append(format_sensor_ts(after))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT {', '.join(READING_COLUMNS[:7])} FROM readings {where} ORDER BY timestamp, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        for rows in timed_iter("sql", self._fetch_chunks(sql, params)):
+            for row in rows:
+                yield self._reading(row)
+
+    def iter_last_readings(self, n: int):
+        rows = self._query(
+            f"SELECT {', '.join(READING_COLUMNS[:7])} FROM readings "
+            "ORDER BY timestamp DESC, id DESC LIMIT ?",
+            (n,),
+        ).fetchall()
+        for row in reversed(rows):
+            yield self._reading(row)
+
+    def reading_count(self) -> int:
+        return self._query("SELECT COUNT(*) FROM readings").fetchone()[0]
+
+    def readings_version(self):
+        # rows are only ever appended, so the newest id is enough
+        return self._query("SELECT MAX(id) FROM readings").fetchone()[0]
+
+    def iter_reading_chunks(self, start=None, end=None, chunk_size: int = 50_000):
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(format_sensor_ts(start))
+        if end is not None:
+            clauses.append("timestamp <= ?")
+            params.append(format_sensor_ts(end))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        chunks = self._fetch_chunks(
+            f"SELECT {', '.join(READING_COLUMNS[:7])} FROM readings {where} ORDER BY timestamp, id",
+            params,
+            chunk=chunk_size,
+            row_factory=None,  # plain tuples are cheaper here
+        )
+        for rows in chunks:
+            stamps = np.array([row[0] for row in rows], dtype=object)
+            features = np.array([row[1:7] for row in rows], dtype=np.float64)
+            yield stamps, features
+
+    # ---------- predictions ----------
+
+    def append_predictions(self, rows):
+        self._insert("predictions", PREDICTION_HEADERS, rows)
+
+    def latest_prediction(self):
+        row = self._query(
+            f"SELECT {', '.join(PREDICTION_HEADERS)} FROM predictions ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+        return dict(row) if row else None
+
+    def iter_predictions(self):
+        for rows in self._fetch_chunks(f"SELECT {', '.join(PREDICTION_HEADERS)} FROM predictions ORDER BY id"):
+            for row in rows:
+                yield dict(row)
+
+    # ---------- notifications ----------
+
+    def append_notification(self, timestamp: str, level: str, message: str):
+        self.append_notifications([(timestamp, level, message)])
+
+    def append_notifications(self, rows):
+        """Append rows laid out like NOTIFICATION_HEADERS in one transaction."""
+        self._insert("notifications", NOTIFICATION_HEADERS, rows)
+
+    def iter_notifications(self, start: int = 0):
+        chunks = self._fetch_chunks(
+            f"SELECT {', '.join(NOTIFICATION_HEADERS)} FROM notifications "
+            "ORDER BY id LIMIT -1 OFFSET ?",
+            (start,),
+        )
+        for rows in chunks:
+            for row in rows:
+                yield dict(row)
+
+    # ---------- users ----------
+
+    def find_user(self, email: str):
+        row = self._query(
+            f"SELECT {', '.join(USER_HEADERS)} FROM users WHERE email = ? ORDER BY id LIMIT 1",
+            (email,),
+        ).fetchone()
+        return dict(row) if row else None
+
+    def add_user(self, user: dict):
+        self._insert("users", USER_HEADERS, [[user[key] for key in USER_HEADERS]])
+
+    def iter_users(self):
+        for rows in self._fetch_chunks(f"SELECT {', '.join(USER_HEADERS)} FROM users ORDER BY id"):
+            for row in rows:
+                yield dict(row)
+
+    def users_version(self):
+        # users are never updated or deleted, so the newest id is enough
+        return self._query("SELECT MAX(id) FROM users").fetchone()[0]
@@ -0,0 +1,183 @@
+import atexit
+import csv
+import io
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+from app.config import WRITER_BATCH_ROWS, WRITER_FLUSH_SECONDS, WRITER_FSYNC
+
+# pending appends before submit() blocks the producer
+MAX_PENDING = 10_000
+
+logger = logging.getLogger(__name__)
+
+
+class GroupCommitWriter:
+    """
+    Single writer thread for append-only CSV files.
+
+    Producers queue rows with submit() and return at once. The writer
+    drains the queue, groups what it got by file and writes each group
+    with one open/write/close, flushing after `batch_rows` rows or
+    `flush_seconds` after the oldest pending append, whichever comes
+    first (optionally with fsync).
+
+    While a file has appends of ours queued or being written, it
+    publishes a committed offset: the end of the last batch that was
+    completely written. In-process readers stop there, so they never see
+    half a line. Once everything has landed there is no offset, and
+    readers go to the file's last complete line again, which also picks
+    up rows other processes appended since.
+    """
+
+    def __init__(
+        self,
+        batch_rows: int = WRITER_BATCH_ROWS,
+        flush_seconds: float = WRITER_FLUSH_SECONDS,
+        fsync: bool = WRITER_FSYNC,
+    ):
+        self.batch_rows = batch_rows
+        self.flush_seconds = flush_seconds
+        self.fsync = fsync
+        self.batches = 0  # write rounds so far
+        self._queue = queue.Queue(maxsize=MAX_PENDING)
+        self._committed = {}
+        self._in_flight = {}  # path -> submits not yet written
+        self._lock = threading.Lock()
+        self._thread = None
+
+    # ---------- producer side ----------
+
+    def submit(self, path, header, rows, wait: bool = False):
+        """
+        Queue `rows` for appending to `path` (`header` is written first
+        if the file is new or empty). With `wait=True`, block until they
+        are committed; write errors are raised to the caller.
+        """
+        path = Path(path)
+        with self._lock:
+            if path not in self._committed:
+                # everything already on disk counts as committed
+                self._committed[path] = path.stat().st_size if path.exists() else 0
+            self._in_flight[path] = self._in_flight.get(path, 0) + 1
+            self._start()
+
+        done = Future() if wait else None
+        self._queue.put((path, header, rows, done))
+        if done is not None:
+            done.result()
+
+    def committed(self, path):
+        """
+        Bytes of `path` that are fully written while appends of ours are
+        still in flight; None when we have nothing pending for it.
+        """
+        path = Path(path)
+        with self._lock:
+            if not self._in_flight.get(path):
+                return None
+            return self._committed.get(path)
+
+    def pending(self) -> int:
+        """Appends queued but not yet picked up by the writer thread."""
+        return self._queue.qsize()
+
+    def flush(self):
+        """Block until everything queued so far is on disk."""
+        if self._thread is None:
+            return
+        done = Future()
+        self._queue.put((None, None, (), done))
+        done.result()
+
+    def close(self):
+        """Flush and stop the writer thread."""
+        if self._thread is None:
+            return
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def _start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="csv-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    # ---------- writer thread ----------
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            pending = len(item[2])
+            deadline = time.monotonic() + self.flush_seconds
+            while pending < self.batch_rows:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._commit(batch)
+                    return
+                batch.append(item)
+                pending += len(item[2])
+            self._commit(batch)
+
+    def _commit(self, batch):
+        groups = {}
+        submits = {}
+        for path, header, rows, done in batch:
+            if path is not None:
+                group = groups.setdefault(path, (header, [], []))
+                group[1].extend(rows)
+                submits[path] = submits.get(path, 0) + 1
+            else:
+                group = groups.setdefault(None, (None, [], []))
+            if done is not None:
+                group[2].append(done)
+
+        for path, (header, rows, waiters) in groups.items():
+            error = None
+            if path is not None and rows:
+                try:
+                    self._write(path, header, rows)
+                except Exception as e:
+                    logger.exception("CSV write failed", extra={"path": str(path)})
+                    error = e
+            if path is not None:
+                with self._lock:
+                    self._in_flight[path] -= submits[path]
+            for done in waiters:
+                if error is None:
+                    done.set_result(None)
+                else:
+                    done.set_exception(error)
+        self.batches += 1
+
+    def _write(self, path: Path, header, rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if not path.exists() or path.stat().st_size == 0:
+            writer.writerow(header)
+        writer.writerows(rows)
+
+        with open(path, "ab") as f:
+            f.write(buffer.getvalue().encode("utf-8"))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+            end = f.tell()
+        self._committed[path] = end
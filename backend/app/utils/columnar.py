@@ -0,0 +1,49 @@
+import json
+import struct
+
+import numpy as np
+
+COLUMNS_BINARY_MEDIA_TYPE = "application/octet-stream"
+
+# magic, bytes per value (4 or 8), rows, value columns; all little-endian
+COLUMNS_BINARY_HEADER = struct.Struct("<4sIII")
+COLUMNS_BINARY_MAGIC = b"TWC1"
+
+SEPARATORS = (",", ":")
+
+
+def epoch_ms(t) -> np.ndarray:
+    """Epoch seconds (int64) as epoch milliseconds, float64 like a JS Date."""
+    return np.asarray(t, dtype=np.int64).astype(np.float64) * 1000
+
+
+def _json_array(values, float32: bool) -> str:
+    if float32:
+        # numpy prints float32 with the fewest digits that round-trip it
+        return "[" + ",".join(values.astype(np.float32).astype(str)) + "]"
+    return json.dumps(values.tolist(), separators=SEPARATORS)
+
+
+def encode_columns_json(t, cols, names, float32: bool = False) -> bytes:
+    """
+    {"timestamp": [epoch ms, ...], name: [values, ...], ...} for epoch
+    seconds `t` and a (len(names), n) value matrix, encoded straight from
+    the arrays. `float32` rounds values to float32 precision.
+    """
+    parts = ['"timestamp":' + json.dumps(epoch_ms(t).astype(np.int64).tolist(), separators=SEPARATORS)]
+    for name, values in zip(names, cols):
+        parts.append(json.dumps(name) + ":" + _json_array(values, float32))
+    return ("{" + ",".join(parts) + "}").encode("utf-8")
+
+
+def encode_columns_binary(t, cols, float32: bool = False) -> bytes:
+    """
+    The same columns as raw arrays: COLUMNS_BINARY_HEADER, then `rows`
+    float64 epoch-ms timestamps, then each value column in turn as
+    `rows` float32 or float64 values. Every array starts aligned to its
+    item size, so a browser can view it as a typed array without copying.
+    """
+    dtype = np.dtype("<f4" if float32 else "<f8")
+    cols = np.asarray(cols)
+    header = COLUMNS_BINARY_HEADER.pack(COLUMNS_BINARY_MAGIC, dtype.itemsize, len(t), len(cols))
+    return header + epoch_ms(t).astype("<f8").tobytes() + cols.astype(dtype).tobytes()
@@ -0,0 +1,120 @@
+import csv
+import io
+import os
+
+from app.utils.profiling import phase
+
+BLOCK_SIZE = 4096
+
+
+def last_line_start(f, end: int, floor: int = 0) -> int:
+    """
+    Return the byte offset where the line ending at `end` begins.
+
+    `f` is a binary file object and `end` is the offset just past a "\\n".
+    Scans backwards block by block, so the cost depends on the line
+    length, not the file size. Never goes below `floor` (e.g. the header).
+    """
+    pos = end - 1  # skip the line's own "\n"
+    while pos > floor:
+        start = max(floor, pos - BLOCK_SIZE)
+        f.seek(start)
+        block = f.read(pos - start)
+        idx = block.rfind(b"\n")
+        if idx >= 0:
+            return start + idx + 1
+        pos = start
+    return floor
+
+
+def last_newline(f, size: int) -> int:
+    """Offset just past the last "\\n" in the file, or 0 if there is none."""
+    pos = size
+    while pos > 0:
+        start = max(0, pos - BLOCK_SIZE)
+        f.seek(start)
+        idx = f.read(pos - start).rfind(b"\n")
+        if idx >= 0:
+            return start + idx + 1
+        pos = start
+    return 0
+
+
+def read_last_row(path, end: int | None = None):
+    """
+    Return the newest complete row of a CSV file as a dict, or None.
+
+    Seeks backwards from EOF instead of parsing the whole file, so the
+    latency stays flat however long the history gets. A trailing line
+    that has no "\n" yet (a write in progress) is ignored, and so is
+    anything past byte offset `end` when given.
+    """
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return None
+
+    with f:
+        header_line = f.readline()
+        if not header_line.endswith(b"\n"):
+            return None
+        header = next(csv.reader([header_line.decode("utf-8")]))
+        floor = f.tell()
+
+        size = f.seek(0, os.SEEK_END)
+        end = last_newline(f, size if end is None else min(end, size))
+        while end > floor:
+            start = last_line_start(f, end, floor)
+            f.seek(start)
+            line = f.read(end - start).decode("utf-8").strip()
+            if line:
+                values = next(csv.reader([line]))
+                return dict(zip(header, values))
+            end = start  # skip blank lines
+    return None
+
+
+class RangeReader(io.RawIOBase):
+    """
+    Read-only view of bytes [start, end) of an open binary file, which
+    it closes along with itself.
+    """
+
+    def __init__(self, f, start: int, end: int):
+        self._f = f
+        self._pos = start
+        self._end = end
+
+    def readable(self):
+        return True
+
+    def close(self):
+        if not self.closed:
+            self._f.close()
+        super().close()
+
+    def readinto(self, buffer):
+        n = min(len(buffer), self._end - self._pos)
+        if n <= 0:
+            return 0
+        with phase("io"):
+            self._f.seek(self._pos)
+            data = self._f.read(n)
+        buffer[:len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+
+def open_range(path, start: int = 0, end: int | None = None, text: bool = False):
+    """
+    Open `path` for reading bytes [start, end) only (end=None: to EOF).
+    With `text=True` the range is decoded as UTF-8 for the csv module.
+    """
+    f = open(path, "rb")
+    if end is None:
+        end = f.seek(0, os.SEEK_END)
+    stream = io.BufferedReader(RangeReader(f, start, end))
+    if text:
+        return io.TextIOWrapper(stream, encoding="utf-8", newline="")
+    return stream
+
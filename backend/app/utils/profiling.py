@@ -0,0 +1,291 @@
+import cProfile
+import functools
+import inspect
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+
+from fastapi.routing import APIRoute
+
+from app.config import PROFILE_DIR, PROFILE_SAMPLE_SECONDS
+
+# set by the debug middleware for requests that asked for timings
+_timings: ContextVar = ContextVar("request_timings", default=None)
+
+# one profile at a time: cProfile is per thread, samples would interleave
+_profile_lock = threading.Lock()
+
+
+class RequestTimings:
+    """
+    Where one request spent its time, by phase, for the Server-Timing
+    header.
+
+    Phases nest and are exclusive: while "io" runs inside "csv", the time
+    is booked to "io" only, so the phases add up to the measured total.
+    A request is handled by one thread at a time, so there is no locking.
+    """
+
+    def __init__(self, profile: str | None = None):
+        self.profile = profile  # None, "cprofile" or "sample"
+        self.profile_file = None
+        self.endpoint = None  # "METHOD /path", names the profile file
+        self.phases = {}
+        self._stack = []  # [name, started] of the open phases
+
+    def start(self, name: str):
+        now = time.perf_counter()
+        if self._stack:
+            parent = self._stack[-1]
+            self.phases[parent[0]] = self.phases.get(parent[0], 0.0) + now - parent[1]
+        self._stack.append([name, now])
+
+    def stop(self):
+        now = time.perf_counter()
+        name, started = self._stack.pop()
+        self.phases[name] = self.phases.get(name, 0.0) + now - started
+        if self._stack:
+            self._stack[-1][1] = now  # the parent resumes
+
+    def switch(self, name: str):
+        """Close the innermost phase and open `name` in its place."""
+        self.stop()
+        self.start(name)
+
+    def header(self, total: float) -> str:
+        """Server-Timing value: every phase plus `total`, in milliseconds."""
+        parts = [f"{name};dur={seconds * 1e3:.3f}" for name, seconds in self.phases.items()]
+        parts.append(f"total;dur={total * 1e3:.3f}")
+        return ", ".join(parts)
+
+
+def current_timings():
+    """The RequestTimings of the request being handled, or None."""
+    return _timings.get()
+
+
+def begin_request(timings: RequestTimings):
+    return _timings.set(timings)
+
+
+def end_request(token):
+    _timings.reset(token)
+
+
+@contextmanager
+def phase(name: str):
+    """Book the enclosed block to `name`; a no-op unless timing is on."""
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+    timings.start(name)
+    try:
+        yield
+    finally:
+        timings.stop()
+
+
+def timed_iter(name: str, iterable):
+    """
+    Book the time spent producing each item of `iterable` to `name`.
+    Returns `iterable` untouched unless timing is on.
+    """
+    timings = _timings.get()
+    if timings is None:
+        return iterable
+    return _timed_iter(timings, name, iter(iterable))
+
+
+def timed_fn(name: str, fn):
+    """
+    `fn`, booking each call to `name` while timing is on. Look it up once
+    per request, outside per-row loops.
+    """
+    timings = _timings.get()
+    if timings is None:
+        return fn
+
+    def timed(*args, **kwargs):
+        timings.start(name)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            timings.stop()
+    return timed
+
+
+def _timed_iter(timings: RequestTimings, name: str, it):
+    while True:
+        timings.start(name)
+        try:
+            item = next(it)
+        except StopIteration:
+            return
+        finally:
+            timings.stop()
+        yield item
+
+
+# ===============================
+# PROFILES
+# ===============================
+
+class StackSampler:
+    """
+    Samples one thread's Python stack every `interval` seconds from a
+    background thread. Stacks are kept in "folded" form (frames joined by
+    ";", root first), the input format of flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, thread_id: int, interval: float = PROFILE_SAMPLE_SECONDS):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def _profile_path(request_name: str, suffix: str):
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", request_name).strip("-") or "root"
+    return PROFILE_DIR / f"{datetime.now():%Y%m%d-%H%M%S-%f}-{slug}{suffix}"
+
+
+@contextmanager
+def _profiled(timings: RequestTimings, request_name: str):
+    """Profile the enclosed block in this thread, as the request asked."""
+    if timings.profile is None or not _profile_lock.acquire(blocking=False):
+        yield
+        return
+    try:
+        if timings.profile == "cprofile":
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+                path = _profile_path(request_name, ".prof")
+                profiler.dump_stats(path)
+        else:
+            sampler = StackSampler(threading.get_ident())
+            sampler.start()
+            try:
+                yield
+            finally:
+                sampler.stop()
+                path = _profile_path(request_name, ".folded")
+                sampler.dump(path)
+        timings.profile_file = path.name
+    finally:
+        _profile_lock.release()
+
+
+def profiled(fn):
+    """
+    `fn`, profiled in whatever thread calls it if the current request
+    asked for a profile. Async endpoints wrap the work they hand to the
+    threadpool with this; the event loop thread is never profiled.
+    """
+    timings = _timings.get()
+    if timings is None or timings.profile is None:
+        return fn
+
+    def call(*args, **kwargs):
+        with _profiled(timings, timings.endpoint):
+            return fn(*args, **kwargs)
+    return call
+
+
+# ===============================
+# ROUTES
+# ===============================
+
+def _timed_endpoint(endpoint, name: str):
+    """Wrap an endpoint so its body is booked to "handler" (and profiled)."""
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def timed(*args, **kwargs):
+            timings = _timings.get()
+            if timings is None:
+                return await endpoint(*args, **kwargs)
+            # the event loop runs other requests too, so only the work the
+            # endpoint hands to threads is profiled (see profiled())
+            timings.endpoint = name
+            try:
+                with phase("handler"):
+                    return await endpoint(*args, **kwargs)
+            finally:
+                timings.switch("encode")
+    else:
+        @functools.wraps(endpoint)
+        def timed(*args, **kwargs):
+            timings = _timings.get()
+            if timings is None:
+                return endpoint(*args, **kwargs)
+            timings.endpoint = name
+            try:
+                with phase("handler"), _profiled(timings, name):
+                    return endpoint(*args, **kwargs)
+            finally:
+                timings.switch("encode")
+    return timed
+
+
+class TimedRoute(APIRoute):
+    """
+    APIRoute that reports, for requests with timing on, how long FastAPI
+    spent before the endpoint ("validate": reading and validating the
+    request), in it ("handler", minus nested phases) and after it
+    ("encode": response model validation and JSON encoding).
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        methods = ",".join(sorted(kwargs.get("methods") or ["GET"]))
+        super().__init__(path, _timed_endpoint(endpoint, f"{methods} {path}"), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            timings = _timings.get()
+            if timings is None:
+                return await handler(request)
+            # the endpoint wrapper switches this to "encode" on return
+            timings.start("validate")
+            try:
+                response = await handler(request)
+            finally:
+                timings.stop()
+            return response
+
+        return timed_handler
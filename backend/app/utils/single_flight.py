@@ -0,0 +1,48 @@
+import asyncio
+
+
+class SingleFlight:
+    """
+    Runs a blocking function once per key for any number of concurrent
+    async callers.
+
+    The first caller starts `fn` in a worker thread; callers with the same
+    key that arrive while it runs, or up to `ttl` seconds after it
+    finished, await that same result instead of taking a thread of their
+    own. Failures are handed to everyone waiting but not kept. A caller
+    going away never cancels the shared call.
+
+    Only used from the event loop thread, so there is no locking.
+    """
+
+    def __init__(self, ttl: float = 0.0):
+        self.ttl = ttl
+        self._calls = {}  # key -> asyncio.Task
+
+    async def run(self, key, fn):
+        """(fn's result, whether it was shared with an earlier caller)."""
+        task = self._calls.get(key)
+        shared = task is not None
+        if task is None:
+            task = asyncio.ensure_future(asyncio.to_thread(fn))
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        return await asyncio.shield(task), shared
+
+    def _done(self, key, task):
+        # exception() also marks a failure as seen when nobody awaited it
+        if task.cancelled() or task.exception() is not None or self.ttl <= 0:
+            self._forget(key, task)
+        else:
+            asyncio.get_running_loop().call_later(self.ttl, self._forget, key, task)
+
+    def _forget(self, key, task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+    def clear(self):
+        """Forget kept results, so the next caller computes afresh."""
+        self._calls = {key: task for key, task in self._calls.items() if not task.done()}
+
+    def __len__(self):
+        return len(self._calls)
@@ -0,0 +1,27 @@
+import json
+
+from fastapi.responses import StreamingResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def iter_ndjson(rows, batch_size: int = 500):
+    """Encode dicts as newline-delimited JSON, `batch_size` lines per chunk."""
+    batch = []
+    for row in rows:
+        batch.append(json.dumps(row, separators=(",", ":")))
+        if len(batch) >= batch_size:
+            batch.append("")
+            yield "\n".join(batch).encode("utf-8")
+            batch = []
+    if batch:
+        batch.append("")
+        yield "\n".join(batch).encode("utf-8")
+
+
+def ndjson_response(rows, batch_size: int = 500) -> StreamingResponse:
+    """
+    Stream an iterable of dicts as NDJSON. `rows` should be a generator so
+    that only one batch is held in memory at a time.
+    """
+    return StreamingResponse(iter_ndjson(rows, batch_size), media_type=NDJSON_MEDIA_TYPE)
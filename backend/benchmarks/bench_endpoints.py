@@ -0,0 +1,292 @@
+"""
+Endpoint latency, memory and background-tick benchmarks across data sizes.
+
+    python -m benchmarks.bench_endpoints [--sizes 1k,100k,10M] [--requests N] [--out PATH]
+
+For every size a data directory is generated (benchmarks.datasets, reused
+between runs) and measured in a fresh process with DATA_DIR pointing at
+it, so module-level caches and peak memory don't leak between sizes.
+Each process times the hot endpoints through FastAPI's TestClient
+(p50/p99/mean over N requests, after one warm-up request), records the
+Python heap peak of one extra request with tracemalloc, then times model
+inference and the sensor and prediction ticks. Endpoint rows are timed
+with the response cache cleared before every request; for cached
+endpoints "<name>_cached" rows repeat them with the cache warm.
+
+Results for all sizes go to one JSON file, so runs can be compared over
+time. Background jobs are not started.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.datasets import BENCH_PASSWORD, MARKER, generate, user_email
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_MODEL = BENCH_DIR.parent / "data" / "rockfall_rf.joblib"
+
+SIZES = {"1k": 1_000, "100k": 100_000, "10M": 10_000_000}
+
+# whole-history responses are skipped above this: 10M readings as one
+# JSON list is gigabytes, not a latency measurement
+FULL_SCAN_MAX_ROWS = 100_000
+
+# stop repeating a slow request after this many seconds (min 5 samples)
+CASE_BUDGET_SECONDS = 30
+
+
+def _percentiles(samples) -> dict:
+    ms = np.asarray(samples) * 1e3
+    return {
+        "count": len(ms),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+        "mean_ms": round(float(ms.mean()), 3),
+        "min_ms": round(float(ms.min()), 3),
+        "max_ms": round(float(ms.max()), 3),
+    }
+
+
+def _sample(fn, n: int) -> list:
+    samples = []
+    budget_end = time.perf_counter() + CASE_BUDGET_SECONDS
+    for i in range(n):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+        if i >= 4 and time.perf_counter() > budget_end:
+            break
+    return samples
+
+
+def _heap_peak_mb(fn) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return round(tracemalloc.get_traced_memory()[1] / 2**20, 3)
+    finally:
+        tracemalloc.stop()
+
+
+def _cases(dataset: dict):
+    """(name, method, path, kwargs) for every endpoint measured on `dataset`."""
+    rows = dataset["rows"]
+    oldest = datetime.fromisoformat(dataset["oldest"])
+    newest = datetime.fromisoformat(dataset["newest"])
+    hour = timedelta(hours=1)
+
+    cases = [
+        ("sensors_readings_page", "GET", "/sensors/readings", {"params": {"limit": 1000}}),
+        ("sensors_readings_recent_hour", "GET", "/sensors/readings",
+         {"params": {"from": (newest - hour).isoformat()}}),
+        ("sensors_readings_recent_hour_columns", "GET", "/sensors/readings",
+         {"params": {"from": (newest - hour).isoformat(), "format": "columns"}}),
+        ("sensors_readings_recent_hour_binary", "GET", "/sensors/readings",
+         {"params": {"from": (newest - hour).isoformat(), "format": "binary", "float32": "true"}}),
+        ("sensors_readings_oldest_hour", "GET", "/sensors/readings",
+         {"params": {"from": oldest.isoformat(), "to": (oldest + hour).isoformat()}}),
+        ("sensors_health", "GET", "/sensors/health", {}),
+        ("predict", "GET", "/predict", {}),
+        ("predict_latest", "GET", "/predict/latest", {}),
+        ("notifications_latest_100", "GET", "/notifications", {"params": {"limit": 100}}),
+        ("notifications_critical_100", "GET", "/notifications",
+         {"params": {"level": "critical", "limit": 100}}),
+        ("login", "POST", "/login",
+         {"json": {"email": user_email(rows - 1), "password": BENCH_PASSWORD}}),
+    ]
+    if rows <= FULL_SCAN_MAX_ROWS:
+        cases += [
+            ("sensors_readings_full", "GET", "/sensors/readings", {}),
+            ("sensors_readings_full_columns", "GET", "/sensors/readings", {"params": {"format": "columns"}}),
+            ("notifications_full", "GET", "/notifications", {}),
+        ]
+    return cases
+
+
+# ===============================
+# MEASURING (runs with DATA_DIR set)
+# ===============================
+
+def measure(requests: int) -> dict:
+    """Benchmark the app against the generated data directory in DATA_DIR."""
+    from fastapi.testclient import TestClient
+
+    from app.config import DATA_DIR
+    from app.main import app
+    from app.models.rockfall_rf import get_model
+    from app.services.prediction_generator import run_prediction_tick
+    from app.services.response_cache import response_cache
+    from app.services.sensor_generator import run_sensor_tick
+    from app.services.sensor_store import sensor_store
+    from app.storage import storage
+    from routes import prediction as prediction_routes
+
+    # /predict/latest lives in routes/, which app.main doesn't mount
+    if not any(getattr(r, "path", None) == "/predict/latest" for r in app.routes):
+        app.include_router(prediction_routes.router)
+
+    dataset = json.loads((DATA_DIR / MARKER).read_text())
+    result = {"rows": dataset["rows"], "endpoints": {}, "ticks": {}}
+
+    started = time.perf_counter()
+    model = get_model()
+    result["model_load_seconds"] = round(time.perf_counter() - started, 3)
+    started = time.perf_counter()
+    sensor_store.seq  # warm the in-memory store from storage
+    result["sensor_store_warmup_seconds"] = round(time.perf_counter() - started, 3)
+
+    # no `with`: the lifespan would start the background jobs
+    client = TestClient(app)
+    for name, method, path, kwargs in _cases(dataset):
+        def call():
+            response = client.request(method, path, **kwargs)
+            if response.status_code != 200:
+                raise RuntimeError(f"{name}: HTTP {response.status_code} {response.text[:200]}")
+            return response
+
+        def uncached():
+            response_cache.clear()
+            return call()
+
+        first = time.perf_counter()
+        response = uncached()
+        cold = time.perf_counter() - first
+        stats = _percentiles(_sample(uncached, requests))
+        stats["cold_ms"] = round(cold * 1e3, 3)
+        stats["response_bytes"] = len(response.content)
+        stats["heap_peak_mb"] = _heap_peak_mb(uncached)
+        rows = [(name, stats)]
+        # only endpoints served through the response cache send an ETag
+        if "etag" in response.headers:
+            rows.append((f"{name}_cached", _percentiles(_sample(call, requests))))
+        for label, row in rows:
+            result["endpoints"][label] = row
+            print(f"  {label:<44} p50 {row['p50_ms']:>9.3f} ms  p99 {row['p99_ms']:>9.3f} ms", file=sys.stderr)
+
+    rng = np.random.default_rng(0)
+    one = rng.uniform([0.05, 0.05, 9.6, 20, 1.5, 120], [0.4, 0.4, 10.2, 35, 3.5, 220], (1, 6))
+    batch = rng.uniform([0.05, 0.05, 9.6, 20, 1.5, 120], [0.4, 0.4, 10.2, 35, 3.5, 220], (1000, 6))
+    result["inference"] = {
+        "single_row": _percentiles(_sample(lambda: model.predict_array(one), requests)),
+        "batch_1000": _percentiles(_sample(lambda: model.predict_array(batch), requests)),
+    }
+
+    # one new reading per prediction tick, like the live jobs
+    sensor_ticks, prediction_ticks = [], []
+    run_prediction_tick()  # sets its cursor
+    for _ in range(requests):
+        started = time.perf_counter()
+        run_sensor_tick()
+        sensor_ticks.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        run_prediction_tick()
+        prediction_ticks.append(time.perf_counter() - started)
+    storage.flush()
+    result["ticks"]["sensor"] = _percentiles(sensor_ticks)
+    result["ticks"]["prediction"] = _percentiles(prediction_ticks)
+
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result["max_rss_mb"] = round(maxrss / (2**20 if sys.platform == "darwin" else 2**10), 1)
+    return result
+
+
+# ===============================
+# DRIVER
+# ===============================
+
+def _run_size(label: str, rows: int, data_root: Path, requests: int) -> dict:
+    data_dir = data_root / label
+    print(f"📦 {label}: preparing {rows} rows in {data_dir}", file=sys.stderr)
+    started = time.perf_counter()
+    generate(data_dir, rows)
+    generate_seconds = time.perf_counter() - started
+
+    # writes from the ticks (and a trained model, if there is no artifact)
+    # stay in the scratch directory
+    env = dict(os.environ, DATA_DIR=str(data_dir), STORAGE_BACKEND="csv")
+    env.pop("SQLITE_PATH", None)
+    if "MODEL_PATH" not in os.environ:
+        # the repo's artifact if there is one; otherwise train once for all sizes
+        env["MODEL_PATH"] = str(REPO_MODEL if REPO_MODEL.exists() else data_root / REPO_MODEL.name)
+
+    with tempfile.NamedTemporaryFile(suffix=".json") as out:
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_endpoints",
+             "--measure", "--requests", str(requests), "--result", out.name],
+            cwd=BENCH_DIR.parent,
+            env=env,
+            check=True,
+        )
+        result = json.loads(Path(out.name).read_text())
+    result["size"] = label
+    result["generate_seconds"] = round(generate_seconds, 3)
+    return result
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BENCH_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(SIZES), help=f"comma-separated, from {list(SIZES)}")
+    parser.add_argument("--requests", type=int, default=100, help="timed requests per endpoint")
+    parser.add_argument("--data-root", default=Path(tempfile.gettempdir()) / "terra-watchers-bench",
+                        help="where generated datasets are kept between runs")
+    parser.add_argument("--out", help="results JSON (default: benchmarks/results/endpoints-<time>.json)")
+    # internal: one size, in a child process with DATA_DIR set
+    parser.add_argument("--measure", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        Path(args.result).write_text(json.dumps(measure(args.requests)))
+        return
+
+    labels = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    unknown = [s for s in labels if s not in SIZES]
+    if unknown:
+        parser.error(f"unknown sizes {unknown}; choose from {list(SIZES)}")
+
+    report = {
+        "benchmark": "endpoints",
+        "started": datetime.now().isoformat(timespec="seconds"),
+        "git": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "requests": args.requests,
+        "results": [
+            _run_size(label, SIZES[label], Path(args.data_root), args.requests)
+            for label in labels
+        ],
+    }
+
+    out = Path(args.out) if args.out else (
+        BENCH_DIR / "results" / f"endpoints-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Compare FlatForest against sklearn for RockfallRF scoring.
+
+    python -m benchmarks.bench_inference [--rows N] [--repeat N] [--check-only]
+
+Checks that both paths give the same outputs (including inputs sitting
+exactly on split thresholds), and that RockfallRF's scoring methods
+match sklearn for batch sizes on both sides of FLAT_MAX_BATCH, where it
+switches between them. Then times single-row and batch scoring.
+Exits non-zero if any output diverges.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from app.models.rockfall_rf import FLAT_MAX_BATCH, RockfallRF
+
+# outputs are rounded to 3 decimals; raw forests must agree to float noise
+TOLERANCE = 1e-9
+
+
+def _timeit(fn, repeat: int) -> float:
+    """Best-of-`repeat` wall time in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _inputs(rf: RockfallRF, rows: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    n_features = rf.model.n_features_in_
+    # training range, realistic sensor ranges, and exact split thresholds
+    return np.vstack([
+        rng.random((rows, n_features)),
+        rng.uniform([0.05, 0.05, 9.6, 20, 1.5, 120], [0.4, 0.4, 10.2, 35, 3.5, 220], (rows, n_features)),
+        np.tile(rng.choice(rf.flat.threshold[np.isfinite(rf.flat.threshold)], rows)[:, None], n_features),
+    ])
+
+
+def check_equivalence(rf: RockfallRF, rows: int) -> list[str]:
+    """Every way FlatForest or RockfallRF disagrees with sklearn; empty if none."""
+    X = _inputs(rf, rows)
+    failures = []
+
+    max_err = float(np.max(np.abs(rf.model.predict(X) - rf.flat.predict(X))))
+    print(f"max |sklearn - flat| = {max_err:.3e}")
+    if max_err > TOLERANCE:
+        failures.append(f"FlatForest.predict differs from sklearn by {max_err:.3e}")
+
+    # RockfallRF picks flat or sklearn by batch size; both must score alike
+    for n in sorted({1, FLAT_MAX_BATCH - 1, FLAT_MAX_BATCH, FLAT_MAX_BATCH + 1, len(X)}):
+        expected = np.round(np.clip(rf.model.predict(X[:n]), 0.0, 1.0), 3)
+        got = rf.predict_array(X[:n])
+        if got.shape != expected.shape or not np.array_equal(got, expected):
+            failures.append(f"predict_array differs from sklearn for a batch of {n} rows")
+
+    expected = np.round(np.clip(rf.model.predict(X[:1]), 0.0, 1.0), 3)[0]
+    if rf.predict_probability(X[0]) != expected:
+        failures.append("predict_probability differs from sklearn")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000, help="batch size")
+    parser.add_argument("--repeat", type=int, default=20, help="timing repetitions")
+    parser.add_argument("--check-only", action="store_true", help="check equivalence, skip timings")
+    args = parser.parse_args()
+
+    rf = RockfallRF()
+
+    failures = check_equivalence(rf, args.rows)
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}", file=sys.stderr)
+        sys.exit(1)
+    print("✅ FlatForest and RockfallRF match sklearn")
+    if args.check_only:
+        return
+
+    one = np.random.default_rng(1).random((1, rf.model.n_features_in_))
+    batch = np.random.default_rng(2).random((args.rows, rf.model.n_features_in_))
+
+    results = {
+        "single_sklearn": _timeit(lambda: rf.model.predict(one), args.repeat),
+        "single_flat": _timeit(lambda: rf.flat.predict(one), args.repeat),
+        "batch_sklearn": _timeit(lambda: rf.model.predict(batch), args.repeat),
+        "batch_flat": _timeit(lambda: rf.flat.predict(batch), args.repeat),
+    }
+    for name, seconds in results.items():
+        print(f"{name:<15} {seconds * 1e3:9.3f} ms")
+    print(f"single-row speedup: {results['single_sklearn'] / results['single_flat']:.1f}x")
+    print(f"batch speedup:      {results['batch_sklearn'] / results['batch_flat']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
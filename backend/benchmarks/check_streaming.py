@@ -0,0 +1,118 @@
+"""
+Check concurrent NDJSON streams against the SQLite backend.
+
+    python -m benchmarks.check_streaming [--rows N] [--streams N]
+
+Generates a data directory (benchmarks.datasets), copies it into a fresh
+SQLite database and, in a child process using that database, opens
+`streams` concurrent `format=ndjson` responses for /sensors/readings and
+/notifications. The in-memory sensor store is kept small and `from`
+starts at the oldest reading, so readings are streamed from storage.
+Starlette advances each stream's generator on whatever threadpool
+thread is free, so this fails if a storage iterator is tied to the
+thread that started it. Exits non-zero if any stream errors or comes
+back different from the others.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.datasets import MARKER, generate
+
+BENCH_DIR = Path(__file__).resolve().parent
+
+
+async def _streams(count: int) -> list[str]:
+    import httpx
+
+    from app.config import DATA_DIR
+    from app.main import app
+    from app.storage import storage
+
+    oldest = json.loads((DATA_DIR / MARKER).read_text())["oldest"]
+    expected = {
+        "/sensors/readings": storage.reading_count(),
+        "/notifications": sum(1 for _ in storage.iter_notifications()),
+    }
+    params = {
+        "/sensors/readings": {"format": "ndjson", "from": oldest},
+        "/notifications": {"format": "ndjson"},
+    }
+
+    async def consume(client, path):
+        lines = []
+        async with client.stream("GET", path, params=params[path]) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line:
+                    lines.append(line)
+        return lines
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        failures = []
+        for path, rows in expected.items():
+            results = await asyncio.gather(
+                *(consume(client, path) for _ in range(count)), return_exceptions=True,
+            )
+            for i, result in enumerate(results):
+                if isinstance(result, BaseException):
+                    failures.append(f"{path} stream {i}: {result!r}")
+                elif len(result) != rows:
+                    failures.append(f"{path} stream {i}: {len(result)} rows, expected {rows}")
+                elif result != results[0]:
+                    failures.append(f"{path} stream {i} differs from stream 0")
+            print(f"{path}: {count} streams of {rows} rows")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20_000, help="rows per data file")
+    parser.add_argument("--streams", type=int, default=8, help="concurrent streams per endpoint")
+    parser.add_argument("--data-root", default=Path(tempfile.gettempdir()) / "terra-watchers-bench",
+                        help="where generated datasets are kept between runs")
+    # internal: the streams, in a child process using the generated data
+    parser.add_argument("--run", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        failures = asyncio.run(_streams(args.streams))
+        if failures:
+            for failure in failures:
+                print(f"❌ {failure}", file=sys.stderr)
+            sys.exit(1)
+        print("✅ concurrent streams all complete and identical")
+        return
+
+    data_dir = Path(args.data_root) / f"streaming-{args.rows}"
+    generate(data_dir, args.rows)
+    db = data_dir / "streaming.db"
+    db.unlink(missing_ok=True)
+
+    env = dict(
+        os.environ,
+        DATA_DIR=str(data_dir),
+        STORAGE_BACKEND="sqlite",
+        SQLITE_PATH=str(db),
+        SENSOR_STORE_CAPACITY=str(max(args.rows // 10, 1)),
+    )
+    subprocess.run(
+        [sys.executable, "-m", "app.storage.migrate", "--data-dir", str(data_dir), "--db", str(db)],
+        cwd=BENCH_DIR.parent, env=env, check=True,
+    )
+    child = subprocess.run(
+        [sys.executable, "-m", "benchmarks.check_streaming",
+         "--run", "--streams", str(args.streams)],
+        cwd=BENCH_DIR.parent, env=env,
+    )
+    sys.exit(child.returncode)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Synthetic data directories for the benchmarks.
+
+    python -m benchmarks.datasets DIR --rows N
+
+Writes sensors.csv, prediction.csv, notifications.csv and users.csv with
+`rows` rows each, in the same layouts the app writes, plus copies of the
+small static files (sensor health, mine info, settings) from data/.
+Readings are 5 s apart and end at generation time.
+
+A directory is generated once and reused: the marker file records each
+file's size, and a later run cuts the files back to it, so appends made
+by a benchmark don't pile up.
+"""
+import argparse
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.services.backfill import risk_levels
+from app.services.load_generator import SiteWalks
+from app.storage.base import NOTIFICATION_HEADERS, PREDICTION_HEADERS, SENSOR_HEADERS, USER_HEADERS
+
+REPO_DATA = Path(__file__).resolve().parent.parent / "data"
+STATIC_FILES = ["sensor_health.csv", "mine_info.csv", "mine_info.json", "settings.json"]
+
+SENSOR_INTERVAL = 5  # seconds between generated readings
+CHUNK = 200_000
+MARKER = ".dataset.json"
+GENERATED = ["sensors.csv", "prediction.csv", "notifications.csv", "users.csv"]
+# state the app derives from the data; dropped when a directory is reused
+DERIVED = ["notifications_read.json", "latest.snapshot", "generators.lock"]
+
+BENCH_PASSWORD = "bench-password"
+
+
+def user_email(i: int) -> str:
+    return f"user{i}@example.com"
+
+
+def _timestamps(start: np.datetime64, first: int, n: int, unit: str) -> np.ndarray:
+    t = start + (np.arange(first, first + n) * SENSOR_INTERVAL).astype("timedelta64[s]")
+    return np.datetime_as_string(t.astype(f"datetime64[{unit}]"))
+
+
+def _write(path: Path, header, rows: int, make_chunk):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        f.write(",".join(header) + "\n")
+        for first in range(0, rows, CHUNK):
+            make_chunk(first, min(CHUNK, rows - first)).to_csv(f, header=False, index=False)
+
+
+def _reuse(data_dir: Path, rows: int):
+    """The marker of a complete earlier run, with its files reset; or None."""
+    try:
+        info = json.loads((data_dir / MARKER).read_text())
+    except (OSError, ValueError):
+        return None
+    if info.get("rows") != rows:
+        return None
+    for name, size in info["sizes"].items():
+        path = data_dir / name
+        if not path.exists() or path.stat().st_size < size:
+            return None
+        os.truncate(path, size)
+    for name in DERIVED:
+        (data_dir / name).unlink(missing_ok=True)
+    return info
+
+
+def generate(data_dir, rows: int, seed: int = 0) -> dict:
+    """
+    Fill `data_dir` with `rows` rows per file, or reset a complete earlier
+    run. Returns the marker: {"rows", "oldest", "newest", "sizes"}.
+    """
+    data_dir = Path(data_dir)
+    info = _reuse(data_dir, rows)
+    if info is not None:
+        return info
+    data_dir.mkdir(parents=True, exist_ok=True)
+    (data_dir / MARKER).unlink(missing_ok=True)
+    for name in DERIVED:
+        (data_dir / name).unlink(missing_ok=True)
+
+    rng = np.random.default_rng(seed)
+    now = np.datetime64(datetime.now().replace(microsecond=0), "s")
+    start = now - np.timedelta64((rows - 1) * SENSOR_INTERVAL, "s")
+    walks = SiteWalks(1000, seed)
+
+    def sensors(first, n):
+        values = np.vstack([walks.step()[0] for _ in range(-(-n // 1000))])[:n]
+        events = rng.choice(["Normal", "Warning", "Critical"], n, p=[0.9, 0.08, 0.02])
+        stamps = np.char.replace(_timestamps(start, first, n, "s"), "T", " ")
+        df = pd.DataFrame(values, columns=SENSOR_HEADERS[1:7])
+        df.insert(0, SENSOR_HEADERS[0], stamps)
+        df[SENSOR_HEADERS[7]] = events
+        return df
+
+    def predictions(first, n):
+        prob = np.round(rng.uniform(0, 35, n), 1)
+        return pd.DataFrame({
+            "timestamp": _timestamps(start, first, n, "us"),
+            "probability": prob,
+            "next3Hours": risk_levels(prob),
+            "next6Hours": risk_levels(prob + 5),
+            "next12Hours": risk_levels(prob + 10),
+            "next24Hours": risk_levels(prob + 15),
+            "locationX": 12.5,
+            "locationY": 8.3,
+            "locationZ": -45.0,
+        }, columns=PREDICTION_HEADERS)
+
+    def notifications(first, n):
+        prob = pd.Series(np.round(rng.uniform(0, 90, n), 1))
+        level = pd.Series(risk_levels(prob.to_numpy()))
+        return pd.DataFrame({
+            "timestamp": _timestamps(start, first, n, "us"),
+            "level": level,
+            "message": "Rockfall risk is " + level.str.upper() + " (" + prob.astype(str) + "%)",
+        }, columns=NOTIFICATION_HEADERS)
+
+    def users(first, n):
+        ids = pd.Series(np.arange(first, first + n)).astype(str)
+        return pd.DataFrame({
+            "firstName": "Bench",
+            "lastName": "User" + ids,
+            "email": "user" + ids + "@example.com",
+            "password": BENCH_PASSWORD,
+            "employeeId": "AD" + ids.str.zfill(7),
+        }, columns=USER_HEADERS)
+
+    _write(data_dir / "sensors.csv", SENSOR_HEADERS, rows, sensors)
+    _write(data_dir / "prediction.csv", PREDICTION_HEADERS, rows, predictions)
+    _write(data_dir / "notifications.csv", NOTIFICATION_HEADERS, rows, notifications)
+    _write(data_dir / "users.csv", USER_HEADERS, rows, users)
+    for name in STATIC_FILES:
+        if (REPO_DATA / name).exists():
+            shutil.copy(REPO_DATA / name, data_dir / name)
+
+    info = {
+        "rows": rows,
+        "oldest": str(start),
+        "newest": str(start + np.timedelta64((rows - 1) * SENSOR_INTERVAL, "s")),
+        "sizes": {name: (data_dir / name).stat().st_size for name in GENERATED},
+    }
+    (data_dir / MARKER).write_text(json.dumps(info, indent=2))
+    return info
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("data_dir")
+    parser.add_argument("--rows", type=int, default=1000)
+    args = parser.parse_args()
+    info = generate(args.data_dir, args.rows)
+    print(f"{info['rows']} rows per file in {args.data_dir} ({info['oldest']} .. {info['newest']})")
+
+
+if __name__ == "__main__":
+    main()